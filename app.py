@@ -1,17 +1,54 @@
 from enum import unique
-from flask import Flask, render_template, request, redirect, session, url_for , jsonify
+from flask import Flask, render_template, request, redirect, session, url_for , jsonify, g, has_request_context, abort, send_from_directory, stream_with_context, make_response
 from flask_sqlalchemy import SQLAlchemy
-from datetime import datetime
+from flask_sqlalchemy.session import Session as FlaskSession
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError, OperationalError
+from datetime import datetime, timedelta
 import os
 import re
+from markupsafe import Markup
+from werkzeug.exceptions import RequestEntityTooLarge
+from werkzeug.middleware.proxy_fix import ProxyFix
 from werkzeug.utils import secure_filename
-import uuid
-from flask import flash
+from flask import Request
+from collections import OrderedDict, Counter
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+import bcrypt
+import click
+import cProfile
+import csv
+import hashlib
+import hmac
+import io
+import json
+import math
+import mimetypes
+import numpy as np
+import pickle
+import queue
+import random
+import shutil
+import sqlite3
+import time
+import tempfile
+import threading
+from flask import flash, before_render_template, template_rendered
 
 
 app = Flask(__name__)
 app.secret_key = os.environ.get("FLASK_SECRET_KEY", "dev-secret-key")
 
+# Render (and nginx) sit in front of the app: take the client address and
+# scheme from the X-Forwarded-* headers set by the last PROXY_HOPS proxies,
+# so per-IP rate limits see clients, not the proxy. Set 0 when clients
+# connect directly, or they can send any address they like.
+PROXY_HOPS = int(os.environ.get("PROXY_HOPS", 1))
+if PROXY_HOPS:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=PROXY_HOPS, x_proto=PROXY_HOPS)
+
 # ===================== DATABASE CONFIG (SQLALCHEMY) =====================
 # Default: local SQLite file "site.db" in the project folder.
 # To use MySQL/Postgres etc, change this URI, for example:
@@ -22,7 +59,472 @@ app.config["SQLALCHEMY_DATABASE_URI"] = os.environ.get(
 )
 app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
 
-db = SQLAlchemy(app)
+# ---------- connection tuning ----------
+# SQLite: every connection switches to WAL (readers no longer wait for a
+# writer), waits SQLITE_BUSY_TIMEOUT ms for a lock instead of failing,
+# fsyncs less (synchronous=NORMAL is safe in WAL mode) and memory-maps
+# the file. Postgres/MySQL: a fixed-size pool per worker process that
+# checks connections before use and replaces them before the server's
+# idle timeout drops them. Size DB_POOL_SIZE to the threads per worker.
+SQLITE_PRAGMAS = {
+    "journal_mode": os.environ.get("SQLITE_JOURNAL_MODE", "WAL"),
+    "busy_timeout": int(os.environ.get("SQLITE_BUSY_TIMEOUT", 5000)),
+    "synchronous": os.environ.get("SQLITE_SYNCHRONOUS", "NORMAL"),
+    "mmap_size": int(os.environ.get("SQLITE_MMAP_SIZE", 256 * 1024 * 1024)),
+}
+
+
+def engine_options(url):
+    if url.startswith("sqlite"):
+        return {}
+    return {
+        "pool_size": int(os.environ.get("DB_POOL_SIZE", 5)),
+        "max_overflow": int(os.environ.get("DB_MAX_OVERFLOW", 5)),
+        "pool_timeout": int(os.environ.get("DB_POOL_TIMEOUT", 30)),
+        "pool_recycle": int(os.environ.get("DB_POOL_RECYCLE", 1800)),
+        "pool_pre_ping": True,
+    }
+
+
+@event.listens_for(Engine, "connect")
+def tune_sqlite(dbapi_connection, connection_record):
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    for name, value in SQLITE_PRAGMAS.items():
+        cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
+
+
+app.config["SQLALCHEMY_ENGINE_OPTIONS"] = engine_options(app.config["SQLALCHEMY_DATABASE_URI"])
+
+# ---------- read replicas ----------
+# DATABASE_REPLICA_URLS (comma separated) lists read-only copies of the
+# database, kept in sync by the database's own replication. GET requests
+# to the endpoints in REPLICA_ENDPOINTS read from one of them; every other
+# request, and every flush, uses the primary. After a request that wrote,
+# the user's session stays on the primary for REPLICA_STICKY_SECONDS so
+# they see their own change even while the replicas lag.
+REPLICA_URLS = [url.strip() for url in os.environ.get("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+REPLICA_STICKY_SECONDS = float(os.environ.get("REPLICA_STICKY_SECONDS", 5))
+REPLICA_ENDPOINTS = {
+    "jobportal", "buyerlist", "application", "export_applications",
+    "workerprofile", "companyprofile",
+    "recommended_jobs", "job_candidates", "market_matches",
+}
+replica_engines = [create_engine(url, **engine_options(url)) for url in REPLICA_URLS]
+
+
+def replica_for_request():
+    """The replica engine this request reads from, or None for the primary."""
+    if not replica_engines or not has_request_context():
+        return None
+    if "replica" not in g:
+        g.replica = None
+        if (request.method in ("GET", "HEAD")
+                and request.endpoint in REPLICA_ENDPOINTS
+                and time.time() - session.get("wrote_at", 0) > REPLICA_STICKY_SECONDS):
+            g.replica = random.choice(replica_engines)
+    return g.replica
+
+
+@contextmanager
+def primary_reads():
+    """Send the queries inside to the primary, even in a replica request.
+
+    Used when filling shared caches: a lagging replica's rows would be
+    stored under the current cache version and outlive the lag.
+    """
+    if not has_request_context():
+        yield
+        return
+    replica = replica_for_request()
+    g.replica = None
+    try:
+        yield
+    finally:
+        g.replica = replica
+
+
+class RoutingSession(FlaskSession):
+    """Session that sends a read-only request's queries to a replica."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing:
+            replica = replica_for_request()
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def remember_flush(db_session, flush_context):
+    if has_request_context():
+        g.wrote = True
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def remember_bulk_write(execute_state):
+    # db.session.execute(insert/update/delete) doesn't flush
+    if has_request_context() and (
+        execute_state.is_insert or execute_state.is_update or execute_state.is_delete
+    ):
+        g.wrote = True
+
+
+@app.after_request
+def stick_to_primary(response):
+    if replica_engines and g.get("wrote"):
+        session["wrote_at"] = time.time()
+    return response
+
+
+db = SQLAlchemy(app, session_options={"class_": RoutingSession})
+
+# ===================== QUERY COUNTER =====================
+# Counts the SELECT statements each request runs (g.select_count).
+# Set SELECT_BUDGET (e.g. in tests) to make any request that runs more
+# SELECTs than that fail, so N+1 lazy loads show up as errors instead of
+# slow pages.
+app.config["SELECT_BUDGET"] = int(os.environ.get("SELECT_BUDGET", 0)) or None
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def count_selects(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context() and statement.lstrip().upper().startswith("SELECT"):
+        g.select_count = g.get("select_count", 0) + 1
+
+
+@app.after_request
+def check_select_budget(response):
+    budget = app.config["SELECT_BUDGET"]
+    count = g.get("select_count", 0)
+    if budget and count > budget:
+        raise RuntimeError(
+            f"{request.endpoint} ran {count} SELECTs (budget {budget}), "
+            "probably a lazy load per row"
+        )
+    return response
+
+
+# ===================== METRICS =====================
+# Prometheus text format on /metrics: request latency per endpoint, SQL
+# statements and SQL time per request, template render time and upload
+# throughput. Values live in this process; the Procfile runs one worker
+# process, with more, scrape each worker or expect per-worker numbers.
+#
+# PROFILE_SLOW_REQUESTS=<seconds> profiles every request with cProfile and
+# keeps the stats of those slower than that in PROFILE_DIR (open them with
+# `python -m pstats` or snakeviz). Profiling slows every request; turn it
+# on while hunting a regression, not permanently.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+STATEMENT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 250, 1000)
+PROFILE_SLOW_REQUESTS = float(os.environ.get("PROFILE_SLOW_REQUESTS", 0)) or None
+PROFILE_DIR = os.environ.get("PROFILE_DIR", os.path.join(app.instance_path, "profiles"))
+
+
+class Metrics:
+    """Counters and histograms, rendered in Prometheus text format."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.kinds = {}
+        self.help = {}
+        self.buckets = {}
+        # (name, labels) -> value for counters, [bucket counts, sum, count] for histograms
+        self.values = {}
+
+    def counter(self, name, help_text):
+        self.kinds[name], self.help[name] = "counter", help_text
+
+    def histogram(self, name, help_text, buckets):
+        self.kinds[name], self.help[name] = "histogram", help_text
+        self.buckets[name] = buckets
+
+    def inc(self, name, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            series = self.values.get(key)
+            if series is None:
+                series = self.values[key] = [[0] * len(self.buckets[name]), 0.0, 0]
+            for i, bound in enumerate(self.buckets[name]):
+                if value <= bound:
+                    series[0][i] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        lines = []
+        with self.lock:
+            for name, kind in self.kinds.items():
+                lines.append(f"# HELP {name} {self.help[name]}")
+                lines.append(f"# TYPE {name} {kind}")
+                for (series_name, labels), value in sorted(self.values.items()):
+                    if series_name != name:
+                        continue
+                    if kind == "counter":
+                        lines.append(f"{name}{prometheus_labels(labels)} {value}")
+                        continue
+                    counts, total, count = value
+                    for bound, bucket_count in zip(self.buckets[name], counts):
+                        lines.append(f"{name}_bucket{prometheus_labels(labels + (('le', bound),))} {bucket_count}")
+                    lines.append(f"{name}_bucket{prometheus_labels(labels + (('le', '+Inf'),))} {count}")
+                    lines.append(f"{name}_sum{prometheus_labels(labels)} {total}")
+                    lines.append(f"{name}_count{prometheus_labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+
+def prometheus_labels(labels):
+    """(("endpoint", "home"),) -> '{endpoint="home"}'"""
+    if not labels:
+        return ""
+    pairs = []
+    for name, value in labels:
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{name}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+metrics = Metrics()
+metrics.histogram("http_request_duration_seconds", "Time to build the response.", LATENCY_BUCKETS)
+metrics.counter("http_requests_total", "Requests by endpoint, method and status.")
+metrics.histogram("http_request_sql_statements", "SQL statements run per request.", STATEMENT_BUCKETS)
+metrics.histogram("http_request_sql_seconds", "Time spent in SQL per request.", LATENCY_BUCKETS)
+metrics.histogram("template_render_seconds", "Time to render a page template.", LATENCY_BUCKETS)
+metrics.counter("upload_bytes_total", "Bytes of uploaded documents received.")
+metrics.counter("upload_seconds_total", "Seconds spent receiving uploaded documents.")
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def start_sql_timer(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context():
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def stop_sql_timer(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("query_started")
+    if has_request_context() and started:
+        g.sql_seconds = g.get("sql_seconds", 0.0) + time.perf_counter() - started.pop()
+        g.sql_statements = g.get("sql_statements", 0) + 1
+
+
+@before_render_template.connect_via(app)
+def start_template_timer(sender, template, context, **extra):
+    g.setdefault("template_started", []).append(time.perf_counter())
+
+
+@template_rendered.connect_via(app)
+def stop_template_timer(sender, template, context, **extra):
+    started = g.get("template_started")
+    if started:
+        metrics.observe("template_render_seconds", time.perf_counter() - started.pop(),
+                        template=template.name or "string")
+
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+    if PROFILE_SLOW_REQUESTS:
+        g.profiler = cProfile.Profile()
+        try:
+            g.profiler.enable()
+        except ValueError:
+            # Another profiler is already running in this thread
+            g.profiler = None
+
+
+@app.after_request
+def record_request_metrics(response):
+    started = g.get("request_started")
+    if started is None:
+        return response
+    elapsed = time.perf_counter() - started
+    endpoint = request.endpoint or "unmatched"
+
+    metrics.observe("http_request_duration_seconds", elapsed, endpoint=endpoint, method=request.method)
+    metrics.inc("http_requests_total", endpoint=endpoint, method=request.method, status=response.status_code)
+    metrics.observe("http_request_sql_statements", g.get("sql_statements", 0), endpoint=endpoint)
+    metrics.observe("http_request_sql_seconds", g.get("sql_seconds", 0.0), endpoint=endpoint)
+
+    profiler = g.pop("profiler", None)
+    if profiler is not None:
+        profiler.disable()
+        if elapsed >= PROFILE_SLOW_REQUESTS:
+            os.makedirs(PROFILE_DIR, exist_ok=True)
+            path = os.path.join(
+                PROFILE_DIR, f"{endpoint}-{int(time.time() * 1000)}-{int(elapsed * 1000)}ms.prof"
+            )
+            profiler.dump_stats(path)
+            print(f"🐢 {request.method} {request.path} took {elapsed:.3f}s, profile: {path}")
+    return response
+
+
+@app.route("/metrics")
+def metrics_endpoint():
+    return metrics.render(), 200, {"Content-Type": "text/plain; version=0.0.4; charset=utf-8"}
+
+
+# ===================== NUMERIC PARSING =====================
+# Salaries, experience and prices arrive as free text ("₹12,000 – ₹18,000",
+# "15k+", "1–2 Years", "Fresher"). They are parsed once, at write time, into
+# numeric min/max columns so range filters can run as indexed SQL.
+# A number with the currency sign before it and the unit word after it, if any
+NUMBER_PATTERN = re.compile(
+    r"(₹|\brs\.?|\binr)?\s*(\d+(?:\.\d+)?)\s*"
+    r"(k|thousand|lakhs?|lacs?|lpa|years?|yrs?|months?|hours?|hrs?|days?|weeks?)?\b"
+)
+NUMBER_MULTIPLIERS = {
+    "k": 1000, "thousand": 1000,
+    "lakh": 100000, "lakhs": 100000, "lac": 100000, "lacs": 100000, "lpa": 100000,
+}
+TIME_UNITS = ("year", "yr", "month", "hour", "hr", "day", "week")
+# Only these join two numbers into a range; "8 hours 12000" is not a range
+RANGE_SEPARATOR = re.compile(r"\s*(?:-|–|—|to)\s*")
+LOWER_BOUND_PATTERN = re.compile(r"\+|\b(?:above|min|minimum|at least|atleast|from|more than)\b")
+UPPER_BOUND_PATTERN = re.compile(r"\b(?:up\s*to|below|max|maximum|under|less than)\b")
+# Salary columns are per month; "3 LPA" or "3,60,000 per annum" is yearly
+YEARLY_PATTERN = re.compile(r"\blpa\b|per\s+annum|\bp\.a\b|per\s+year|/\s*year|\byearly\b")
+# Stored on each parsed row; bump it after a parser change so startup
+# re-parses the rows an older parser wrote
+NUMBER_PARSER_VERSION = 2
+# Daily or hourly wages have no fixed monthly figure; they are left NULL
+DAILY_PATTERN = re.compile(
+    r"per\s+(?:day|hour|hr|shift)\b|/\s*(?:day|hour|hr)\b|\b(?:daily|hourly)\b"
+)
+
+
+def parse_number_range(raw, duration=False):
+    """Return (min, max) floats from free text; either may be None.
+
+    "₹12,000 – ₹18,000" -> (12000, 18000), "12-18k" -> (12000, 18000),
+    "15k+" -> (15000, None), "up to 20000" -> (None, 20000),
+    "15000" -> (15000, 15000), "Negotiable" -> (None, None).
+
+    Amounts skip numbers with a time unit ("8 hours 12000" -> 12000);
+    with duration=True only those and bare numbers count ("At least 2
+    years" -> (2, None)). Two numbers make a range only when joined by
+    "-", "–" or "to"; otherwise the one next to a currency or unit token
+    is taken, and text with several bare numbers gives (None, None).
+    """
+    if not raw:
+        return None, None
+
+    text_value = raw.lower().replace(",", "")
+    numbers = []
+    for match in NUMBER_PATTERN.finditer(text_value):
+        currency, value, unit = match.groups()
+        timed = bool(unit) and unit.startswith(TIME_UNITS)
+        if timed != duration and (unit or currency):
+            continue
+        if duration and currency:
+            continue
+        numbers.append((match, float(value), NUMBER_MULTIPLIERS.get(unit, 1), bool(unit or currency)))
+    if not numbers:
+        return None, None
+
+    for first, second in zip(numbers, numbers[1:]):
+        if RANGE_SEPARATOR.fullmatch(text_value, first[0].end(), second[0].start()):
+            # "12-18k": the unit on the upper bound applies to the lower one too
+            low_multiplier = second[2] if first[2] == 1 else first[2]
+            values = (first[1] * low_multiplier, second[1] * second[2])
+            return min(values), max(values)
+
+    marked = [number for number in numbers if number[3]]
+    if marked:
+        number = marked[0]
+    elif len(numbers) == 1:
+        number = numbers[0]
+    else:
+        return None, None
+    value = number[1] * number[2]
+
+    if LOWER_BOUND_PATTERN.search(text_value):
+        return value, None
+    if UPPER_BOUND_PATTERN.search(text_value):
+        return None, value
+    return value, value
+
+
+def parse_experience_range(raw):
+    """Return (min, max) years of experience, e.g. "Fresher" -> (0, 0)."""
+    if not raw:
+        return None, None
+
+    text_value = raw.lower()
+    if "fresher" in text_value or "no experience" in text_value:
+        return 0.0, 0.0
+
+    low, high = parse_number_range(text_value, duration=True)
+    if "month" in text_value:
+        low = low / 12 if low is not None else None
+        high = high / 12 if high is not None else None
+    return low, high
+
+
+def parse_salary_range(raw):
+    """Return (min, max) pay per month, e.g. "3 LPA" -> (25000, 25000)."""
+    if raw and DAILY_PATTERN.search(raw.lower()):
+        return None, None
+    low, high = parse_number_range(raw)
+    if raw and YEARLY_PATTERN.search(raw.lower()):
+        low = low / 12 if low is not None else None
+        high = high / 12 if high is not None else None
+    return low, high
+
+
+def whole(value):
+    return int(value) if value is not None else None
+
+
+def backfill_numeric_columns(batch_size=1000, reparse=False):
+    """Parse rows written before the numeric columns existed.
+
+    Walks each table in primary-key batches, re-assigning the text fields
+    so the model validators fill in the numeric columns and parsed_version.
+    Only rows not yet parsed by NUMBER_PARSER_VERSION are touched, so text
+    with no number in it is not rescanned on every start; reparse=True
+    redoes every row. Runs on startup. Returns the number of rows that got
+    a number.
+    """
+    targets = [
+        (JobPOST, JobPOST.job_id, ["job_salary", "job_experience"],
+         [JobPOST.salary_min, JobPOST.salary_max, JobPOST.experience_min]),
+        (Application, Application.application_id, ["applicant_expected_salary"],
+         [Application.expected_salary_min, Application.expected_salary_max]),
+    ]
+
+    updated = 0
+    for model, key_column, text_fields, numeric_columns in targets:
+        last_key = 0
+        while True:
+            stale = [] if reparse else [db.or_(
+                model.parsed_version.is_(None),
+                model.parsed_version < NUMBER_PARSER_VERSION
+            )]
+            rows = model.query.filter(
+                key_column > last_key, *stale
+            ).order_by(key_column).limit(batch_size).all()
+            if not rows:
+                break
+
+            for row in rows:
+                for field in text_fields:
+                    setattr(row, field, getattr(row, field))
+            db.session.commit()
+
+            updated += sum(
+                any(getattr(row, column.key) is not None for column in numeric_columns)
+                for row in rows
+            )
+            last_key = getattr(rows[-1], key_column.key)
+    return updated
+
 
 class Worker(db.Model):
     __tablename__ = "worker"
@@ -84,9 +586,40 @@ class JobPOST(db.Model):
     job_salary = db.Column(db.String(128), nullable=False)
     job_contact = db.Column(db.String(128), nullable=False)
     job_description = db.Column(db.Text, nullable=False)
+    # Bumped on every change; part of the cached job card key
+    updated_at = db.Column(db.DateTime, nullable=True, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Parsed from job_salary / job_experience whenever those are set
+    salary_min = db.Column(db.Integer, nullable=True)
+    salary_max = db.Column(db.Integer, nullable=True)
+    experience_min = db.Column(db.Float, nullable=True)
+    experience_max = db.Column(db.Float, nullable=True)
+    # NUMBER_PARSER_VERSION that filled the columns above
+    parsed_version = db.Column(db.Integer, nullable=True)
 
     company = db.relationship('Company', backref='jobs')
 
+    __table_args__ = (
+        # Company dashboard / applications page: jobs of one company
+        db.Index("ix_job_post_company_id", "company_id"),
+        # Job portal range filters
+        db.Index("ix_job_post_salary", "salary_min", "salary_max"),
+        db.Index("ix_job_post_experience", "experience_min"),
+    )
+
+    @db.validates("job_salary")
+    def parse_salary(self, key, value):
+        low, high = parse_salary_range(value)
+        self.salary_min, self.salary_max = whole(low), whole(high)
+        self.parsed_version = NUMBER_PARSER_VERSION
+        return value
+
+    @db.validates("job_experience")
+    def parse_experience(self, key, value):
+        self.experience_min, self.experience_max = parse_experience_range(value)
+        self.parsed_version = NUMBER_PARSER_VERSION
+        return value
+
 
 
 class Application(db.Model):
@@ -109,6 +642,31 @@ class Application(db.Model):
 
     # Relationship to JobPOST
     job = db.relationship('JobPOST', backref='applications')
+    # Applicant account (companies open the resume from here)
+    worker = db.relationship('Worker')
+
+    # Parsed from applicant_expected_salary whenever it is set
+    expected_salary_min = db.Column(db.Integer, nullable=True)
+    expected_salary_max = db.Column(db.Integer, nullable=True)
+    parsed_version = db.Column(db.Integer, nullable=True)
+
+    __table_args__ = (
+        # Worker profile: all applications of one worker
+        db.Index("ix_application_worker_id", "worker_id"),
+        # Applications page: applications of a job, newest first
+        db.Index("ix_application_job_id_date", "job_id", "application_date"),
+        # One application per worker per job (duplicate check in applyjob)
+        db.Index("uq_application_job_worker", "job_id", "worker_id", unique=True),
+        # Applicants of a job by expected salary
+        db.Index("ix_application_job_id_salary", "job_id", "expected_salary_min"),
+    )
+
+    @db.validates("applicant_expected_salary")
+    def parse_expected_salary(self, key, value):
+        low, high = parse_salary_range(value)
+        self.expected_salary_min, self.expected_salary_max = whole(low), whole(high)
+        self.parsed_version = NUMBER_PARSER_VERSION
+        return value
 
     def __repr__(self):
         return f"<Application {self.applicant_name} for Job {self.job_id}>"
@@ -126,6 +684,18 @@ class sellitem(db.Model):
     posted_by = db.Column(db.String(80), nullable=False)  # Store business username/email
     sell_category = db.Column(db.String(80), nullable=True)  # Category field
     sell_location = db.Column(db.String(128), nullable=True)  # Location field
+    updated_at = db.Column(db.DateTime, nullable=True, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        # Company dashboard / marketplace: listings by poster and status, newest first
+        db.Index("ix_sell_item_poster_status_date", "posted_by", "sell_status", "sell_date"),
+        # Market matching: available items of a category by price
+        db.Index("ix_sell_item_category_status_price", "sell_category", "sell_status", "sell_price"),
+        # Marketplace filters, newest first within a category / location
+        db.Index("ix_sell_item_status_id", "sell_status", "sell_id"),
+        db.Index("ix_sell_item_status_category_id", "sell_status", "sell_category", "sell_id"),
+        db.Index("ix_sell_item_status_location_id", "sell_status", "sell_location", "sell_id"),
+    )
 
     def __repr__(self):
         return f"<sellitem {self.sell_name} - ₹{self.sell_price}>"
@@ -144,11 +714,1379 @@ class buyitem(db.Model):
     posted_by = db.Column(db.String(80), nullable=False)  # Store business username/email
     buy_category = db.Column(db.String(80), nullable=True)  # Category field
     buy_location = db.Column(db.String(128), nullable=True)  # Location field
+    updated_at = db.Column(db.DateTime, nullable=True, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        # Company dashboard / marketplace: requirements by poster and status, newest first
+        db.Index("ix_buy_item_poster_status_date", "posted_by", "buy_status", "buy_date"),
+        # Market matching: open requirements of a category by budget
+        db.Index("ix_buy_item_category_status_budget", "buy_category", "buy_status", "buy_budget"),
+        # Marketplace filters, newest first within a category / location
+        db.Index("ix_buy_item_status_id", "buy_status", "buy_id"),
+        db.Index("ix_buy_item_status_category_id", "buy_status", "buy_category", "buy_id"),
+        db.Index("ix_buy_item_status_location_id", "buy_status", "buy_location", "buy_id"),
+    )
 
     def __repr__(self):
         return f"<buyitem {self.buy_name} - Budget: ₹{self.buy_budget if self.buy_budget else 'Negotiable'}>"
 
-    
+
+class MarketMatch(db.Model):
+    """A sell item and a buy requirement that fit each other.
+
+    Written when either listing is posted, so the marketplace never has to
+    compare every sell item with every buy requirement on a page view.
+    """
+    __tablename__ = "market_match"
+    sell_id = db.Column(db.Integer, db.ForeignKey("sell_item.sell_id"), primary_key=True)
+    buy_id = db.Column(db.Integer, db.ForeignKey("buy_item.buy_id"), primary_key=True)
+    score = db.Column(db.Float, nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        # Matches of a buy requirement (the primary key covers sell_id)
+        db.Index("ix_market_match_buy_id", "buy_id"),
+    )
+
+
+class Document(db.Model):
+    __tablename__ = "document"
+    # Stored file name inside UPLOAD_FOLDER (what Worker.aadhar_card etc. hold).
+    # Content-addressed: "<sha256><ext>", so identical uploads share one file.
+    filename = db.Column(db.String(200), primary_key=True)
+    sha256 = db.Column(db.String(64), nullable=False)
+    size = db.Column(db.Integer, nullable=False)
+
+    # Number of Worker document fields pointing at this file
+    ref_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+
+    # Filled in by the background post-processing worker
+    status = db.Column(db.String(20), nullable=False, default="uploaded")
+    # uploaded | processed | invalid
+    content_type = db.Column(db.String(80), nullable=True)
+    page_count = db.Column(db.Integer, nullable=True)
+    thumbnail = db.Column(db.String(200), nullable=True)
+    processed_at = db.Column(db.DateTime, nullable=True)
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<Document {self.filename} ({self.status})>"
+
+
+# ===================== JOB SEARCH (FULL-TEXT INDEX) =====================
+# Full-text index over job title, description, category and company name,
+# kept in its own "job_search" table keyed by job_id:
+#   SQLite   -> FTS5 virtual table, ranked with bm25()
+#   Postgres -> tsvector column with a GIN index, ranked with ts_rank_cd()
+#   MySQL    -> FULLTEXT index, ranked with MATCH ... AGAINST
+# Any other database (or SQLite built without FTS5) falls back to LIKE.
+SEARCH_BACKEND = "like"
+
+
+def init_search_index():
+    """Create the search table for the current database and backfill it."""
+    global SEARCH_BACKEND
+    dialect = db.engine.dialect.name
+
+    try:
+        if dialect == "sqlite":
+            db.session.execute(text(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS job_search USING fts5("
+                "job_title, job_description, job_category, company_name, "
+                "tokenize='porter unicode61')"
+            ))
+            SEARCH_BACKEND = "fts5"
+        elif dialect == "postgresql":
+            db.session.execute(text(
+                "CREATE TABLE IF NOT EXISTS job_search ("
+                "job_id INTEGER PRIMARY KEY REFERENCES job_post(job_id) ON DELETE CASCADE, "
+                "document TSVECTOR NOT NULL)"
+            ))
+            db.session.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_job_search_document "
+                "ON job_search USING GIN (document)"
+            ))
+            SEARCH_BACKEND = "tsvector"
+        elif dialect in ("mysql", "mariadb"):
+            db.session.execute(text(
+                "CREATE TABLE IF NOT EXISTS job_search ("
+                "job_id INTEGER PRIMARY KEY, document TEXT NOT NULL, "
+                "FULLTEXT (document)) ENGINE=InnoDB"
+            ))
+            SEARCH_BACKEND = "fulltext"
+        db.session.commit()
+    except OperationalError:
+        # e.g. SQLite compiled without FTS5
+        db.session.rollback()
+        SEARCH_BACKEND = "like"
+        return
+
+    if SEARCH_BACKEND == "like":
+        return
+
+    # First start on an existing database: index the jobs already posted
+    indexed = db.session.execute(text("SELECT COUNT(*) FROM job_search")).scalar()
+    if not indexed and JobPOST.query.first():
+        rebuild_search_index()
+
+
+def index_job(job):
+    """Add or refresh one job in the search index (caller commits)."""
+    index_jobs([job])
+
+
+def index_jobs(jobs):
+    """Add or refresh several jobs in the search index in one batch."""
+    if SEARCH_BACKEND == "like" or not jobs:
+        return
+
+    rows = []
+    for job in jobs:
+        rows.append({
+            "job_id": job.job_id,
+            "job_title": job.job_title or "",
+            "job_description": job.job_description or "",
+            "job_category": job.job_category or "",
+            "company_name": job.company.company_name if job.company else "",
+        })
+
+    if SEARCH_BACKEND == "fts5":
+        db.session.execute(text("DELETE FROM job_search WHERE rowid = :job_id"), rows)
+        db.session.execute(text(
+            "INSERT INTO job_search(rowid, job_title, job_description, job_category, company_name) "
+            "VALUES (:job_id, :job_title, :job_description, :job_category, :company_name)"
+        ), rows)
+    elif SEARCH_BACKEND == "tsvector":
+        db.session.execute(text("DELETE FROM job_search WHERE job_id = :job_id"), rows)
+        db.session.execute(text(
+            "INSERT INTO job_search(job_id, document) VALUES (:job_id, "
+            "setweight(to_tsvector('simple', :job_title), 'A') || "
+            "setweight(to_tsvector('simple', :company_name), 'B') || "
+            "setweight(to_tsvector('simple', :job_category), 'B') || "
+            "setweight(to_tsvector('simple', :job_description), 'D'))"
+        ), rows)
+    elif SEARCH_BACKEND == "fulltext":
+        for row in rows:
+            row["document"] = " ".join([
+                row["job_title"], row["company_name"],
+                row["job_category"], row["job_description"]
+            ])
+        db.session.execute(text("DELETE FROM job_search WHERE job_id = :job_id"), rows)
+        db.session.execute(text(
+            "INSERT INTO job_search(job_id, document) VALUES (:job_id, :document)"
+        ), rows)
+
+
+def rebuild_search_index():
+    """Re-index every job, e.g. after a bulk load or a company rename."""
+    if SEARCH_BACKEND == "like":
+        return
+
+    db.session.execute(text("DELETE FROM job_search"))
+    batch = []
+    for job in JobPOST.query.options(db.joinedload(JobPOST.company)).yield_per(1000):
+        batch.append(job)
+        if len(batch) == 1000:
+            index_jobs(batch)
+            batch = []
+    index_jobs(batch)
+    db.session.commit()
+
+
+def job_search_hits(q):
+    """Return a subquery of (job_id, score) matching q, best score first.
+
+    Lower score means a better match on every backend. Returns None if q
+    has no searchable words.
+    """
+    words = re.findall(r"\w+", q)
+    if not words:
+        return None
+
+    if SEARCH_BACKEND == "fts5":
+        # Quote every word (no FTS syntax from users) and prefix-match it
+        match = " ".join(f'"{word}"*' for word in words)
+        hits = text(
+            "SELECT rowid AS job_id, bm25(job_search, 10.0, 1.0, 2.0, 5.0) AS score "
+            "FROM job_search WHERE job_search MATCH :match"
+        ).bindparams(match=match)
+    elif SEARCH_BACKEND == "tsvector":
+        match = " & ".join(f"{word}:*" for word in words)
+        hits = text(
+            "SELECT job_id, -ts_rank_cd(document, to_tsquery('simple', :match)) AS score "
+            "FROM job_search WHERE document @@ to_tsquery('simple', :match)"
+        ).bindparams(match=match)
+    elif SEARCH_BACKEND == "fulltext":
+        match = " ".join(f"+{word}*" for word in words)
+        hits = text(
+            "SELECT job_id, -MATCH(document) AGAINST (:match IN BOOLEAN MODE) AS score "
+            "FROM job_search WHERE MATCH(document) AGAINST (:match IN BOOLEAN MODE)"
+        ).bindparams(match=match)
+    else:
+        conditions = []
+        for word in words:
+            pattern = f"%{word}%"
+            conditions.append(db.or_(
+                JobPOST.job_title.ilike(pattern),
+                JobPOST.job_description.ilike(pattern),
+                JobPOST.job_category.ilike(pattern),
+                Company.company_name.ilike(pattern)
+            ))
+        return db.select(
+            JobPOST.job_id.label("job_id"),
+            db.literal(0.0).label("score")
+        ).join(Company).where(*conditions).subquery("hits")
+
+    return hits.columns(job_id=db.Integer, score=db.Float).subquery("hits")
+
+
+@app.cli.command("backfill-numeric")
+@click.option("--all", "reparse", is_flag=True, help="Re-parse every row, not only empty ones.")
+def backfill_numeric_command(reparse):
+    """Fill salary/experience min/max columns for existing rows."""
+    updated = backfill_numeric_columns(reparse=reparse)
+    print(f"✅ Parsed numeric columns for {updated} row(s)")
+
+
+@app.cli.command("reindex-jobs")
+def reindex_jobs_command():
+    """Rebuild the job search index from the job_post table."""
+    rebuild_search_index()
+    print(f"✅ Search index rebuilt ({SEARCH_BACKEND})")
+
+
+# ===================== PAGINATION =====================
+JOBS_PER_PAGE = 20
+
+
+def keyset_page(query, key_column, after, per_page):
+    """Return one page of rows ordered by key_column (newest first).
+
+    Uses keyset (cursor) pagination: instead of OFFSET, the next page starts
+    below the last key we returned, so every page costs the same no matter
+    how deep the user scrolls. Returns (rows, next_cursor); next_cursor is
+    None on the last page.
+    """
+    if after:
+        query = query.filter(key_column < after)
+
+    # Fetch one extra row to know if there is another page
+    rows = query.order_by(key_column.desc()).limit(per_page + 1).all()
+
+    next_cursor = None
+    if len(rows) > per_page:
+        rows = rows[:per_page]
+        next_cursor = getattr(rows[-1], key_column.key)
+
+    return rows, next_cursor
+
+
+def ranked_page(query, score_column, key_column, after, after_score, per_page):
+    """Keyset pagination for search results ordered by score, then key.
+
+    Same idea as keyset_page(), but the cursor is the (score, key) pair of
+    the last row, so relevance ordering survives across pages. `query` is
+    a select of (key, score) only, so ranking and LIMIT run in the search
+    statement and callers load full rows for the page alone. Returns
+    (keys, next_cursor) where next_cursor is a (key, score) tuple or None.
+    """
+    if after is not None and after_score is not None:
+        query = query.where(db.or_(
+            score_column > after_score,
+            db.and_(score_column == after_score, key_column < after)
+        ))
+
+    rows = db.session.execute(
+        query.order_by(score_column, key_column.desc()).limit(per_page + 1)
+    ).all()
+
+    next_cursor = None
+    if len(rows) > per_page:
+        rows = rows[:per_page]
+        next_cursor = tuple(rows[-1])
+
+    return [key for key, _ in rows], next_cursor
+
+
+# ===================== DASHBOARD STATS =====================
+# Counters for the profile pages come from COUNT / GROUP BY queries on
+# indexed columns; the pages themselves only load one window of rows.
+PROFILE_PAGE_SIZE = 10
+
+
+def company_counts(company):
+    """Return (total_jobs_posted, total_b2b_listings) in one query."""
+    jobs = db.select(db.func.count()).select_from(JobPOST).where(
+        JobPOST.company_id == company["id"]
+    ).scalar_subquery()
+    sells = db.select(db.func.count()).select_from(sellitem).where(
+        sellitem.posted_by == company["email"]
+    ).scalar_subquery()
+    buys = db.select(db.func.count()).select_from(buyitem).where(
+        buyitem.posted_by == company["email"]
+    ).scalar_subquery()
+
+    total_jobs, total_sells, total_buys = db.session.execute(
+        db.select(jobs, sells, buys)
+    ).one()
+    return total_jobs, total_sells + total_buys
+
+
+def application_status_counts(job_ids):
+    """Return {job_id: {status: count}} for the given jobs in one query."""
+    counts = {job_id: {} for job_id in job_ids}
+    if not job_ids:
+        return counts
+
+    rows = db.session.query(
+        Application.job_id, Application.applicant_status, db.func.count()
+    ).filter(
+        Application.job_id.in_(job_ids)
+    ).group_by(Application.job_id, Application.applicant_status)
+
+    for job_id, status, count in rows:
+        counts[job_id][status] = count
+    return counts
+
+
+def worker_application_count(worker_id):
+    return db.session.query(
+        db.func.count(Application.application_id)
+    ).filter_by(worker_id=worker_id).scalar()
+
+
+# ===================== DOCUMENT UPLOADS =====================
+# KYC files are streamed straight into UPLOAD_FOLDER while the multipart
+# body is parsed: each chunk is hashed and written to a temp file, and the
+# upload is rejected with 413 as soon as it passes MAX_DOCUMENT_SIZE.
+# The route then only fsyncs and renames the temp file. Post-processing
+# (type sniffing, PDF page count, thumbnail) runs on a background thread.
+# The folder is outside static/: documents are only served by /documents/,
+# which checks who is asking.
+UPLOAD_FOLDER = os.environ.get("UPLOAD_FOLDER", os.path.join(app.instance_path, "uploads"))
+# Older versions stored documents here, where Flask served them to anyone
+LEGACY_UPLOAD_FOLDER = os.path.join(app.root_path, "static", "uploads")
+THUMBNAIL_FOLDER = os.path.join(UPLOAD_FOLDER, "thumbs")
+MAX_DOCUMENT_SIZE = int(os.environ.get("MAX_DOCUMENT_SIZE", 5 * 1024 * 1024))
+MAX_BULK_IMPORT_SIZE = int(os.environ.get("MAX_BULK_IMPORT_SIZE", 100 * 1024 * 1024))
+
+# Three documents per form plus some room for the other fields
+app.config["MAX_CONTENT_LENGTH"] = 3 * MAX_DOCUMENT_SIZE + 64 * 1024
+
+try:
+    from PIL import Image  # optional, only used for thumbnails
+except ImportError:
+    Image = None
+
+
+class HashingUpload:
+    """Writable temp file in UPLOAD_FOLDER that hashes and caps what it gets."""
+
+    def __init__(self, max_size):
+        os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+        fd, self.path = tempfile.mkstemp(prefix=".upload-", dir=UPLOAD_FOLDER)
+        self.file = os.fdopen(fd, "w+b")
+        self.hash = hashlib.sha256()
+        self.size = 0
+        self.max_size = max_size
+        self.stored = False
+        self.started = self.last_write = time.perf_counter()
+        self.recorded = False
+
+    def write(self, chunk):
+        self.last_write = time.perf_counter()
+        self.size += len(chunk)
+        if self.size > self.max_size:
+            self.close()
+            raise RequestEntityTooLarge(
+                f"Each document must be under {self.max_size // (1024 * 1024)} MB"
+            )
+        self.hash.update(chunk)
+        return self.file.write(chunk)
+
+    @property
+    def sha256(self):
+        return self.hash.hexdigest()
+
+    def record_throughput(self):
+        if not self.recorded:
+            self.recorded = True
+            metrics.inc("upload_bytes_total", self.size)
+            metrics.inc("upload_seconds_total", self.last_write - self.started)
+
+    def store(self, filename):
+        """Make the upload durable under its final name."""
+        self.record_throughput()
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.file.close()
+        os.replace(self.path, os.path.join(UPLOAD_FOLDER, filename))
+        self.stored = True
+
+    def close(self):
+        self.record_throughput()
+        # Anything not stored by the route is thrown away
+        if not self.file.closed:
+            self.file.close()
+        if not self.stored and os.path.exists(self.path):
+            os.remove(self.path)
+
+    def __getattr__(self, name):
+        # read/seek/tell etc. for werkzeug's FileStorage
+        return getattr(self.file, name)
+
+
+class UploadRequest(Request):
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        if self.endpoint == "bulk_jobpost":
+            return HashingUpload(MAX_BULK_IMPORT_SIZE)
+        return HashingUpload(MAX_DOCUMENT_SIZE)
+
+    @property
+    def max_content_length(self):
+        # Bulk job imports are much larger than a KYC form
+        if self.endpoint == "bulk_jobpost":
+            return MAX_BULK_IMPORT_SIZE
+        return super().max_content_length
+
+
+app.request_class = UploadRequest
+
+
+CONTENT_ADDRESSED_NAME = re.compile(r"^[0-9a-f]{64}(\.\w+)?$")
+LEGACY_UPLOAD_NAME = re.compile(r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}_")
+
+
+def store_document(upload):
+    """Store one uploaded FileStorage and return its file name.
+
+    The name is the content hash, so a resubmitted file reuses the blob
+    already on disk and the new copy is dropped.
+    """
+    extension = os.path.splitext(secure_filename(upload.filename))[1].lower()
+    filename = f"{upload.stream.sha256}{extension}"
+
+    existing = db.session.get(Document, filename)
+    if existing and os.path.exists(os.path.join(UPLOAD_FOLDER, filename)):
+        upload.stream.close()
+        return filename
+
+    upload.stream.store(filename)
+    if not existing:
+        try:
+            with db.session.begin_nested():
+                db.session.add(Document(
+                    filename=filename,
+                    sha256=upload.stream.sha256,
+                    size=upload.stream.size
+                ))
+        except IntegrityError:
+            # A concurrent upload of the same file inserted the row first;
+            # set_worker_document() then moves that row's ref_count
+            db.session.get(Document, filename, populate_existing=True)
+    return filename
+
+
+def set_worker_document(worker, field, filename):
+    """Point worker.<field> at filename and move the reference counts."""
+    old_filename = getattr(worker, field)
+    if old_filename == filename:
+        return
+
+    if old_filename:
+        Document.query.filter_by(filename=old_filename).update(
+            {Document.ref_count: Document.ref_count - 1}, synchronize_session=False
+        )
+    Document.query.filter_by(filename=filename).update(
+        {Document.ref_count: Document.ref_count + 1}, synchronize_session=False
+    )
+    setattr(worker, field, filename)
+
+
+def collect_document_garbage():
+    """Delete stored documents that no Worker row points to any more.
+
+    Also moves documents from before content-addressed storage (uuid-named
+    files) into the store, and recounts references from the Worker table so
+    drifted counters are corrected. Returns the number of files deleted.
+    """
+    fields = ("aadhar_card", "pan_card", "resume")
+
+    # ---------- adopt legacy uuid-named files ----------
+    for worker in Worker.query.yield_per(500):
+        for field in fields:
+            old_filename = getattr(worker, field)
+            if not old_filename or CONTENT_ADDRESSED_NAME.match(old_filename):
+                continue
+            path = os.path.join(UPLOAD_FOLDER, old_filename)
+            if not os.path.exists(path):
+                continue
+
+            digest = hashlib.sha256()
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    digest.update(chunk)
+            filename = f"{digest.hexdigest()}{os.path.splitext(old_filename)[1].lower()}"
+
+            if not db.session.get(Document, filename):
+                os.replace(path, os.path.join(UPLOAD_FOLDER, filename))
+                db.session.add(Document(
+                    filename=filename, sha256=digest.hexdigest(),
+                    size=os.path.getsize(os.path.join(UPLOAD_FOLDER, filename))
+                ))
+            setattr(worker, field, filename)
+    db.session.commit()
+
+    # ---------- recount references ----------
+    references = db.union_all(*[
+        db.select(getattr(Worker, field).label("filename")) for field in fields
+    ]).subquery()
+    counts = dict(db.session.execute(
+        db.select(references.c.filename, db.func.count())
+        .where(references.c.filename.isnot(None))
+        .group_by(references.c.filename)
+    ).all())
+
+    deleted = 0
+    for document in Document.query.all():
+        document.ref_count = counts.get(document.filename, 0)
+        if document.ref_count:
+            continue
+
+        for name in (document.filename, document.thumbnail):
+            if name and os.path.exists(os.path.join(UPLOAD_FOLDER, name)):
+                os.remove(os.path.join(UPLOAD_FOLDER, name))
+        db.session.delete(document)
+        deleted += 1
+    db.session.commit()
+
+    # ---------- unreferenced legacy files and abandoned temp files ----------
+    if os.path.isdir(UPLOAD_FOLDER):
+        for name in os.listdir(UPLOAD_FOLDER):
+            path = os.path.join(UPLOAD_FOLDER, name)
+            abandoned_temp = (
+                name.startswith(".upload-")
+                and os.path.getmtime(path) < datetime.now().timestamp() - 3600
+            )
+            if abandoned_temp or (LEGACY_UPLOAD_NAME.match(name) and name not in counts):
+                os.remove(path)
+                deleted += 1
+
+    return deleted
+
+
+def migrate_legacy_uploads():
+    """Move documents from static/uploads into UPLOAD_FOLDER."""
+    if not os.path.isdir(LEGACY_UPLOAD_FOLDER):
+        return
+    if os.path.realpath(LEGACY_UPLOAD_FOLDER) == os.path.realpath(UPLOAD_FOLDER):
+        return
+
+    moved = 0
+    for root, _, names in os.walk(LEGACY_UPLOAD_FOLDER):
+        target_dir = os.path.join(UPLOAD_FOLDER, os.path.relpath(root, LEGACY_UPLOAD_FOLDER))
+        for name in names:
+            try:
+                os.makedirs(target_dir, exist_ok=True)
+                # Same name means same file (content hash or legacy uuid name)
+                shutil.move(os.path.join(root, name), os.path.join(target_dir, name))
+                moved += 1
+            except OSError as e:
+                # e.g. another worker moved it first
+                print(f"⚠️ Could not move {name} out of static/uploads:", e)
+    if moved:
+        print(f"✅ Moved {moved} document file(s) to {UPLOAD_FOLDER}")
+
+
+@app.before_request
+def hide_legacy_uploads():
+    # Anything left in static/uploads must not bypass can_view_document()
+    if request.path.startswith("/static/uploads/"):
+        abort(404)
+
+
+@app.cli.command("gc-documents")
+def gc_documents_command():
+    """Delete uploaded documents that no worker references."""
+    deleted = collect_document_garbage()
+    print(f"✅ Removed {deleted} unreferenced document file(s)")
+
+
+# ---------- serving ----------
+# Documents never change under a given name (the name is the hash), so
+# they get strong ETags and a year-long immutable Cache-Control. Set
+# DOCUMENT_ACCEL_PREFIX (e.g. "/_protected_uploads/") to let nginx send the
+# file via X-Accel-Redirect; otherwise send_from_directory() streams it
+# with wsgi.file_wrapper (sendfile under gunicorn) and handles Range and
+# If-None-Match itself.
+DOCUMENT_ACCEL_PREFIX = os.environ.get("DOCUMENT_ACCEL_PREFIX")
+DOCUMENT_MAX_AGE = 365 * 24 * 3600
+
+
+def can_view_document(filename):
+    """Worker: their own files. Company: files of workers who applied to them."""
+    references = db.or_(
+        Worker.aadhar_card == filename,
+        Worker.pan_card == filename,
+        Worker.resume == filename
+    )
+    if session.get("user_type") == "worker":
+        match = db.session.query(Worker.id).filter(
+            Worker.id == session.get("worker_id"), references
+        )
+    elif session.get("user_type") == "company":
+        match = db.session.query(Application.application_id).join(
+            JobPOST, JobPOST.job_id == Application.job_id
+        ).join(
+            Worker, Worker.id == Application.worker_id
+        ).filter(
+            JobPOST.company_id == session.get("company_id"), references
+        )
+    else:
+        return False
+    return match.first() is not None
+
+
+@app.route("/documents/<path:filename>")
+def document(filename):
+    # Thumbnails are "thumbs/<hash>.jpg" for the document "<hash>.<ext>"
+    owner_filename = filename
+    if filename.startswith("thumbs/"):
+        thumbnail = Document.query.filter_by(thumbnail=filename).first()
+        owner_filename = thumbnail.filename if thumbnail else None
+
+    if not owner_filename or not can_view_document(owner_filename):
+        abort(404)
+
+    stem = os.path.splitext(os.path.basename(filename))[0]
+    etag = stem if CONTENT_ADDRESSED_NAME.match(os.path.basename(filename)) else None
+    if not etag and filename == owner_filename:
+        stored = db.session.get(Document, filename)
+        etag = stored.sha256 if stored else None
+
+    if DOCUMENT_ACCEL_PREFIX:
+        response = app.response_class(mimetype=mimetypes.guess_type(filename)[0])
+        response.headers["X-Accel-Redirect"] = DOCUMENT_ACCEL_PREFIX + filename
+        if etag:
+            response.set_etag(etag)
+        response.make_conditional(request)
+    else:
+        response = send_from_directory(
+            UPLOAD_FOLDER, filename, conditional=True, etag=etag or True,
+            max_age=DOCUMENT_MAX_AGE
+        )
+
+    # Private: KYC documents must not be kept by shared proxies
+    response.cache_control.private = True
+    response.cache_control.public = False
+    response.cache_control.max_age = DOCUMENT_MAX_AGE
+    response.cache_control.immutable = True
+    return response
+
+
+# ---------- background post-processing ----------
+DOCUMENT_QUEUE = queue.Queue()
+_document_thread = None
+_document_thread_lock = threading.Lock()
+
+
+def enqueue_document(filename):
+    global _document_thread
+    # Started lazily so each gunicorn worker gets its own thread after fork
+    with _document_thread_lock:
+        if _document_thread is None or not _document_thread.is_alive():
+            _document_thread = threading.Thread(
+                target=document_worker, name="document-worker", daemon=True
+            )
+            _document_thread.start()
+    DOCUMENT_QUEUE.put(filename)
+
+
+def document_worker():
+    while True:
+        filename = DOCUMENT_QUEUE.get()
+        try:
+            with app.app_context():
+                process_document(filename)
+        except Exception as e:
+            print("DOCUMENT ERROR:", filename, e)
+        finally:
+            DOCUMENT_QUEUE.task_done()
+
+
+def sniff_content_type(head):
+    if head.startswith(b"%PDF-"):
+        return "application/pdf"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if head.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    return None
+
+
+def count_pdf_pages(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    # Page objects are "/Type /Page"; "/Type /Pages" is the page tree
+    return len(re.findall(rb"/Type\s*/Page(?!s)", data)) or None
+
+
+def make_thumbnail(filename):
+    if Image is None:
+        return None
+
+    os.makedirs(THUMBNAIL_FOLDER, exist_ok=True)
+    thumbnail = f"{os.path.splitext(filename)[0]}.jpg"
+    with Image.open(os.path.join(UPLOAD_FOLDER, filename)) as image:
+        image.thumbnail((240, 240))
+        image.convert("RGB").save(os.path.join(THUMBNAIL_FOLDER, thumbnail), "JPEG")
+    return f"thumbs/{thumbnail}"
+
+
+def process_document(filename):
+    document = Document.query.get(filename)
+    if not document or document.processed_at:
+        return
+
+    path = os.path.join(UPLOAD_FOLDER, filename)
+    with open(path, "rb") as f:
+        document.content_type = sniff_content_type(f.read(16))
+
+    if document.content_type == "application/pdf":
+        document.page_count = count_pdf_pages(path)
+        document.status = "processed"
+    elif document.content_type in ("image/png", "image/jpeg"):
+        document.thumbnail = make_thumbnail(filename)
+        document.status = "processed"
+    else:
+        document.status = "invalid"
+
+    document.processed_at = datetime.utcnow()
+    db.session.commit()
+
+
+# ===================== CACHE =====================
+# Read-heavy listing routes (/jobportal, /apply GET, /b2bbuy) keep their
+# query results in a cache as plain dicts. Keys are grouped in namespaces
+# ("jobs", "market"); every key includes the namespace version, and the
+# write routes call cache.invalidate(namespace) to bump it, so the next
+# read misses instead of serving stale rows.
+#
+# Backends:
+#   CACHE_URL unset      -> MemoryCache: per-process LRU with a TTL. With
+#                           several gunicorn workers, other workers see a
+#                           write within CACHE_TTL seconds.
+#   CACHE_URL=redis://.. -> SharedCache on Redis (needs the redis package);
+#                           versions are shared, so every worker sees a
+#                           write immediately.
+#   CACHE_URL=local://   -> SharedCache on LocalSharedClient, an in-process
+#                           stand-in for Redis (development and benchmarks).
+CACHE_TTL = int(os.environ.get("CACHE_TTL", 60))
+CACHE_MAX_ENTRIES = int(os.environ.get("CACHE_MAX_ENTRIES", 2048))
+
+
+class MemoryCache:
+    """In-process LRU cache whose entries expire after ttl seconds."""
+
+    def __init__(self, max_entries, ttl):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        # Namespace versions never expire or get evicted
+        self.counters = {}
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self.lock:
+            self.entries[key] = (value, time.monotonic() + self.ttl)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def delete(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def get_counter(self, key):
+        with self.lock:
+            return self.counters.get(key, 0)
+
+    def incr(self, key):
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + 1
+            return self.counters[key]
+
+
+class LocalSharedClient:
+    """Tiny in-process stand-in for the parts of redis-py that SharedCache
+    and SharedBuckets use."""
+
+    def __init__(self):
+        self.data = {}
+        self.sets = 0
+        self.lock = threading.Lock()
+
+    def get(self, name):
+        with self.lock:
+            value, expires_at = self.data.get(name, (None, None))
+            if expires_at is not None and expires_at < time.monotonic():
+                del self.data[name]
+                return None
+            return value
+
+    def set(self, name, value, ex=None):
+        with self.lock:
+            self.data[name] = (value, time.monotonic() + ex if ex else None)
+            # Expired keys nobody reads again would otherwise stay forever
+            self.sets += 1
+            if self.sets % 1000 == 0:
+                self.drop_expired()
+
+    def incr(self, name):
+        with self.lock:
+            value = int(self.data.get(name, (0, None))[0]) + 1
+            self.data[name] = (value, None)
+            return value
+
+    def drop_expired(self):
+        now = time.monotonic()
+        for name in [name for name, (_, expires_at) in self.data.items()
+                     if expires_at is not None and expires_at < now]:
+            del self.data[name]
+
+
+class SharedCache:
+    """Cache in a store shared by all workers (Redis or a stand-in)."""
+
+    def __init__(self, client, ttl):
+        self.client = client
+        self.ttl = ttl
+
+    def get(self, key):
+        value = self.client.get(key)
+        return pickle.loads(value) if value is not None else None
+
+    def set(self, key, value):
+        self.client.set(key, pickle.dumps(value), ex=self.ttl)
+
+    def get_counter(self, key):
+        return int(self.client.get(key) or 0)
+
+    def incr(self, key):
+        return self.client.incr(key)
+
+
+class Cache:
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = Counter()
+        self.misses = Counter()
+
+    def get_or_load(self, namespace, key, loader):
+        """Return the cached value for key, calling loader() on a miss."""
+        version = self.backend.get_counter(f"version:{namespace}")
+        full_key = f"{namespace}:{version}:{key}"
+
+        value = self.backend.get(full_key)
+        if value is not None:
+            self.hits[namespace] += 1
+            return value
+
+        self.misses[namespace] += 1
+        with primary_reads():
+            value = loader()
+        self.backend.set(full_key, value)
+        return value
+
+    def invalidate(self, *namespaces):
+        for namespace in namespaces:
+            self.backend.incr(f"version:{namespace}")
+
+    def stats(self):
+        namespaces = sorted(set(self.hits) | set(self.misses))
+        return {
+            namespace: {"hits": self.hits[namespace], "misses": self.misses[namespace]}
+            for namespace in namespaces
+        }
+
+
+def make_cache(url):
+    if not url:
+        return Cache(MemoryCache(CACHE_MAX_ENTRIES, CACHE_TTL))
+    if url.startswith("local://"):
+        return Cache(SharedCache(LocalSharedClient(), CACHE_TTL))
+
+    import redis  # optional, only needed for a shared Redis cache
+    return Cache(SharedCache(redis.Redis.from_url(url), CACHE_TTL))
+
+
+cache = make_cache(os.environ.get("CACHE_URL"))
+
+
+def row_to_dict(row):
+    """Plain-dict copy of a model row, safe to cache and pickle."""
+    return {column.key: getattr(row, column.key) for column in row.__table__.columns}
+
+
+# ---------- rendered card fragments ----------
+# Job and marketplace cards are rendered once per (row id, updated_at) and
+# reused until the row changes, so a listing page only runs Jinja for cards
+# it hasn't seen. Fragments always stay in-process: they depend on the
+# templates, which only change with a deploy (and a restart).
+CARD_TEMPLATES = {
+    # kind: (template, id column, variable name in the template)
+    "job": ("_job_card.html", "job_id", "job"),
+    "sell": ("_sell_card.html", "sell_id", "item"),
+    "buy": ("_buy_card.html", "buy_id", "item"),
+}
+fragment_cache = Cache(MemoryCache(
+    int(os.environ.get("FRAGMENT_CACHE_MAX_ENTRIES", 10000)),
+    int(os.environ.get("FRAGMENT_CACHE_TTL", 3600))
+))
+
+
+@app.template_global()
+def card(kind, row):
+    """Rendered HTML card for a cached row dict."""
+    template, id_column, variable = CARD_TEMPLATES[kind]
+    key = f"{row[id_column]}:{row.get('updated_at')}"
+    html = fragment_cache.get_or_load(
+        kind, key,
+        lambda: app.jinja_env.get_template(template).render({variable: row})
+    )
+    return Markup(html)
+
+
+@app.route("/cache/stats")
+def cache_stats():
+    return jsonify(listings=cache.stats(), fragments=fragment_cache.stats())
+
+
+# ===================== IDENTITY =====================
+# The logged-in worker/company as a small dict (its columns minus the
+# password), loaded at most once per request by current_identity(). The
+# dict is also kept per process for IDENTITY_TTL seconds (0 turns that
+# off), so most authenticated requests don't query for it at all. Routes
+# that change those columns call forget_identity(); other processes pick
+# the change up when their copy expires.
+IDENTITY_TTL = int(os.environ.get("IDENTITY_TTL", 30))
+identity_cache = MemoryCache(int(os.environ.get("IDENTITY_MAX_ENTRIES", 10000)), IDENTITY_TTL)
+
+
+@app.before_request
+def load_identity_key():
+    """Work out who is logged in; current_identity() loads them on first use."""
+    user_type = session.get("user_type")
+    user_id = session.get(f"{user_type}_id") if user_type in ("worker", "company") else None
+    g.identity_key = f"{user_type}:{user_id}" if user_id else None
+
+
+def load_identity(key):
+    user_type, user_id = key.split(":")
+    row = db.session.get(Worker if user_type == "worker" else Company, int(user_id))
+    if row is None:
+        return None
+    record = row_to_dict(row)
+    del record["password"]
+    return record
+
+
+def current_identity():
+    """The logged-in worker/company as a dict, or None."""
+    key = g.get("identity_key")
+    if not key:
+        return None
+    if "identity" not in g:
+        record = identity_cache.get(key) if IDENTITY_TTL else None
+        if record is None:
+            record = load_identity(key)
+            if record is not None and IDENTITY_TTL:
+                identity_cache.set(key, record)
+        g.identity = record
+    return g.identity
+
+
+def forget_identity():
+    """Drop the cached identity after changing the logged-in account's row."""
+    if g.get("identity_key"):
+        identity_cache.delete(g.identity_key)
+    g.pop("identity", None)
+
+
+# ===================== MATCHING =====================
+# Workers have no skill/location/shift fields of their own: the latest
+# application they filled in is their profile. Each process scores profiles
+# against jobs with NumPy and keeps only the best MATCH_TOP_K entries per
+# worker and per job, so serving a ranking is a dict lookup. New jobs and
+# applications are picked up incrementally by id; a full rebuild every
+# MATCH_REBUILD_SECONDS catches everything else (edited jobs, deletes).
+# Both run on a background thread: requests never wait for them and read
+# the last finished rankings (empty until the first build is done).
+MATCH_TOP_K = int(os.environ.get("MATCH_TOP_K", 20))
+MATCH_REFRESH_SECONDS = int(os.environ.get("MATCH_REFRESH_SECONDS", 10))
+MATCH_REBUILD_SECONDS = int(os.environ.get("MATCH_REBUILD_SECONDS", 900))
+MATCH_CHUNK_ROWS = 1024
+# category, location, shift; plus salary when the job pays what the worker asks
+MATCH_WEIGHTS = np.array([3.0, 2.0, 1.0], dtype=np.float32)
+MATCH_SALARY_WEIGHT = 1.0
+
+
+def match_words(value):
+    return re.findall(r"[a-z]+", (value or "").lower())
+
+
+def location_key(value):
+    # "Chakan MIDC" and "chakan" are the same place
+    return " ".join(word for word in match_words(value) if word != "midc")
+
+
+def shift_key(value):
+    # "Day Shift" -> "day"
+    words = match_words(value)
+    return words[0] if words else ""
+
+
+def word_stems(value):
+    # "Welding"/"Welder" and "Electrical"/"Electrician" share their first 4 letters
+    return {word[:4] for word in match_words(value) if len(word) >= 3}
+
+
+def top_columns(scores, k):
+    """Column indexes and scores of the k best entries of each row, best first."""
+    k = min(k, scores.shape[1])
+    columns = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    best = np.take_along_axis(scores, columns, axis=1)
+    order = np.argsort(-best, axis=1, kind="stable")
+    return np.take_along_axis(columns, order, axis=1), np.take_along_axis(best, order, axis=1)
+
+
+def ranked_lists(ids, scores):
+    """[(id, score), ...] per row of two matrices, dropping zero scores."""
+    return [
+        [(int(i), float(s)) for i, s in zip(row_ids, row_scores) if s > 0]
+        for row_ids, row_scores in zip(ids, scores)
+    ]
+
+
+def merge_ranking(ranking, entries, k, drop=()):
+    """Best k of an existing ranking plus new entries, without ids in drop."""
+    merged = [entry for entry in ranking if entry[0] not in drop]
+    merged.extend(entry for entry in entries if entry[1] > 0)
+    merged.sort(key=lambda entry: -entry[1])
+    return merged[:k]
+
+
+class MatchRankings:
+    """Top-k worker<->job rankings plus the features they were built from."""
+
+    def __init__(self, top_k):
+        self.top_k = top_k
+        self.codes = {}
+        self.category_stems = {}
+        self.max_job_id = 0
+        self.max_application_id = 0
+        # one row per job / worker: category, location, shift codes
+        self.job_ids = np.zeros(0, dtype=np.int64)
+        self.job_features = np.zeros((0, 3), dtype=np.int32)
+        self.job_salary = np.zeros(0)
+        self.job_floor = np.zeros(0, dtype=np.float32)
+        self.worker_ids = np.zeros(0, dtype=np.int64)
+        self.worker_features = np.zeros((0, 3), dtype=np.int32)
+        self.worker_salary = np.zeros(0)
+        self.worker_row = {}
+        # id -> [(id, score), ...], best first
+        self.top_jobs = {}
+        self.top_workers = {}
+
+    # ---------- features ----------
+    def code(self, kind, key, missing):
+        # Unknown values get different codes on the two sides so they never match
+        if not key:
+            return missing
+        return self.codes.setdefault((kind, key), len(self.codes))
+
+    def job_vector(self, category, location, shift):
+        key = " ".join(match_words(category))
+        category_code = self.code("category", key, -2)
+        if category_code >= 0:
+            self.category_stems.setdefault(category_code, word_stems(category))
+        return [category_code, self.code("location", location_key(location), -2),
+                self.code("shift", shift_key(shift), -2)]
+
+    def worker_vector(self, skill, location, shift):
+        # Free-text skill -> the job category sharing most word stems with it
+        stems = word_stems(skill)
+        category_code, overlap = -1, 0
+        for code, category in self.category_stems.items():
+            if len(stems & category) > overlap:
+                category_code, overlap = code, len(stems & category)
+        return [category_code, self.code("location", location_key(location), -1),
+                self.code("shift", shift_key(shift), -1)]
+
+    def scores(self, worker_features, worker_salary, job_features, job_salary):
+        """Score matrix, one row per worker and one column per job."""
+        shape = (len(worker_features), len(job_features))
+        total = np.zeros(shape, dtype=np.float32)
+        # Reused buffers: no float64 temporaries the size of the matrix
+        same = np.empty(shape, dtype=bool)
+        weighted = np.empty(shape, dtype=np.float32)
+        for column, weight in enumerate(MATCH_WEIGHTS):
+            np.equal(worker_features[:, column, None], job_features[None, :, column], out=same)
+            total += np.multiply(same, weight, out=weighted)
+        with np.errstate(invalid="ignore"):
+            # NaN (no parsed salary) compares False
+            np.greater_equal(job_salary[None, :], worker_salary[:, None], out=same)
+        total += np.multiply(same, np.float32(MATCH_SALARY_WEIGHT), out=weighted)
+        return total
+
+    def floors(self, rankings, ids):
+        # Score an entry must beat to get into a full ranking (0 while not full)
+        return np.array([
+            rankings[i][-1][1] if len(rankings.get(i, ())) >= self.top_k else 0.0
+            for i in ids.tolist()
+        ], dtype=np.float32)
+
+    # ---------- loading ----------
+    def load_jobs(self):
+        return db.session.execute(
+            db.select(JobPOST.job_id, JobPOST.job_category, JobPOST.job_location,
+                      JobPOST.job_shift, JobPOST.salary_max)
+            .where(JobPOST.job_id > self.max_job_id)
+            .order_by(JobPOST.job_id)
+        ).all()
+
+    def load_profiles(self, worker_ids=None):
+        latest = db.select(db.func.max(Application.application_id)).group_by(Application.worker_id)
+        if worker_ids is not None:
+            latest = latest.where(Application.worker_id.in_(worker_ids))
+        return db.session.execute(
+            db.select(Application.application_id, Application.worker_id,
+                      Application.applicant_skill, Application.applicant_location,
+                      Application.applicant_preferred_shift, Application.expected_salary_min)
+            .where(Application.application_id.in_(latest))
+        ).all()
+
+    def add_job_rows(self, rows):
+        self.job_ids = np.concatenate([self.job_ids, np.array([row.job_id for row in rows], dtype=np.int64)])
+        self.job_features = np.vstack([self.job_features, np.array(
+            [self.job_vector(row.job_category, row.job_location, row.job_shift) for row in rows],
+            dtype=np.int32
+        ).reshape(-1, 3)])
+        self.job_salary = np.concatenate([self.job_salary, np.array(
+            [np.nan if row.salary_max is None else row.salary_max for row in rows], dtype=float
+        )])
+        self.max_job_id = max(self.max_job_id, rows[-1].job_id)
+
+    def set_worker_rows(self, worker_ids, profiles):
+        by_worker = {row.worker_id: row for row in profiles}
+        added_ids, added_features, added_salary = [], [], []
+        for worker_id in worker_ids:
+            row = by_worker.get(worker_id)
+            vector = self.worker_vector(row.applicant_skill, row.applicant_location,
+                                        row.applicant_preferred_shift) if row else [-1, -1, -1]
+            salary = np.nan if row is None or row.expected_salary_min is None else row.expected_salary_min
+            position = self.worker_row.get(worker_id)
+            if position is None:
+                self.worker_row[worker_id] = len(self.worker_ids) + len(added_ids)
+                added_ids.append(worker_id)
+                added_features.append(vector)
+                added_salary.append(salary)
+            else:
+                self.worker_features[position] = vector
+                self.worker_salary[position] = salary
+        if added_ids:
+            self.worker_ids = np.concatenate([self.worker_ids, np.array(added_ids, dtype=np.int64)])
+            self.worker_features = np.vstack([self.worker_features, np.array(added_features, dtype=np.int32)])
+            self.worker_salary = np.concatenate([self.worker_salary, np.array(added_salary, dtype=float)])
+        if profiles:
+            self.max_application_id = max(self.max_application_id,
+                                          max(row.application_id for row in profiles))
+
+    # ---------- ranking ----------
+    def build(self):
+        jobs = self.load_jobs()
+        if jobs:
+            self.add_job_rows(jobs)
+        profiles = self.load_profiles()
+        self.set_worker_rows([row.worker_id for row in profiles], profiles)
+        if not len(self.job_ids) or not len(self.worker_ids):
+            self.job_floor = np.zeros(len(self.job_ids), dtype=np.float32)
+            return
+
+        # Score MATCH_CHUNK_ROWS workers at a time; each job keeps its best
+        # top_k rows seen so far
+        best_rows = np.zeros((len(self.job_ids), 0), dtype=np.int64)
+        best_scores = np.zeros((len(self.job_ids), 0), dtype=np.float32)
+        for start in range(0, len(self.worker_ids), MATCH_CHUNK_ROWS):
+            stop = start + MATCH_CHUNK_ROWS
+            chunk = self.scores(self.worker_features[start:stop], self.worker_salary[start:stop],
+                                self.job_features, self.job_salary)
+            columns, top = top_columns(chunk, self.top_k)
+            for worker_id, ranking in zip(self.worker_ids[start:stop].tolist(),
+                                          ranked_lists(self.job_ids[columns], top)):
+                self.top_jobs[worker_id] = ranking
+
+            rows, top = top_columns(chunk.T, self.top_k)
+            best_rows = np.hstack([best_rows, rows + start])
+            best_scores = np.hstack([best_scores, top])
+            keep, best_scores = top_columns(best_scores, self.top_k)
+            best_rows = np.take_along_axis(best_rows, keep, axis=1)
+
+        self.top_workers = dict(zip(self.job_ids.tolist(),
+                                    ranked_lists(self.worker_ids[best_rows], best_scores)))
+        self.job_floor = self.floors(self.top_workers, self.job_ids)
+
+    def add_jobs(self, rows):
+        start = len(self.job_ids)
+        self.add_job_rows(rows)
+        new_ids = self.job_ids[start:]
+        self.job_floor = np.concatenate([self.job_floor, np.zeros(len(new_ids), dtype=np.float32)])
+        if not len(self.worker_ids):
+            return
+
+        scores = self.scores(self.worker_features, self.worker_salary,
+                             self.job_features[start:], self.job_salary[start:])
+        workers, top = top_columns(scores.T, self.top_k)
+        for job_id, ranking in zip(new_ids.tolist(), ranked_lists(self.worker_ids[workers], top)):
+            self.top_workers[job_id] = ranking
+        self.job_floor[start:] = self.floors(self.top_workers, new_ids)
+
+        # Only workers for whom a new job beats their current k-th entry
+        floor = self.floors(self.top_jobs, self.worker_ids)
+        for position in np.nonzero(scores.max(axis=1) > floor)[0].tolist():
+            worker_id = int(self.worker_ids[position])
+            self.top_jobs[worker_id] = merge_ranking(
+                self.top_jobs.get(worker_id, []),
+                zip(new_ids.tolist(), scores[position].tolist()), self.top_k
+            )
+
+    def update_workers(self, worker_ids, profiles):
+        known = [self.worker_row[w] for w in worker_ids if w in self.worker_row]
+        old = self.scores(self.worker_features[known], self.worker_salary[known],
+                          self.job_features, self.job_salary)
+        self.set_worker_rows(worker_ids, profiles)
+        positions = [self.worker_row[w] for w in worker_ids]
+        new = self.scores(self.worker_features[positions], self.worker_salary[positions],
+                          self.job_features, self.job_salary)
+        if not len(self.job_ids):
+            return
+
+        columns, top = top_columns(new, self.top_k)
+        for worker_id, ranking in zip(worker_ids, ranked_lists(self.job_ids[columns], top)):
+            self.top_jobs[worker_id] = ranking
+
+        # Jobs that may list one of these workers (old score > 0) or should now.
+        # A worker whose score dropped is replaced at the next full rebuild.
+        touched = new.max(axis=0) > self.job_floor
+        if len(known):
+            touched |= old.max(axis=0) > 0
+        changed = set(worker_ids)
+        for column in np.nonzero(touched)[0].tolist():
+            job_id = int(self.job_ids[column])
+            self.top_workers[job_id] = merge_ranking(
+                self.top_workers.get(job_id, []),
+                zip(worker_ids, new[:, column].tolist()), self.top_k, drop=changed
+            )
+            ranking = self.top_workers[job_id]
+            self.job_floor[column] = ranking[-1][1] if len(ranking) >= self.top_k else 0.0
+
+    def update(self, dirty_workers):
+        # Every ranking is replaced by a new list, never edited in place,
+        # so readers see either the old or the new ranking of an id
+        jobs = self.load_jobs()
+        if jobs:
+            self.add_jobs(jobs)
+
+        changed = set(dirty_workers)
+        changed.update(worker_id for (worker_id,) in db.session.execute(
+            db.select(Application.worker_id).where(Application.application_id > self.max_application_id)
+        ))
+        if changed:
+            worker_ids = sorted(changed)
+            self.update_workers(worker_ids, self.load_profiles(worker_ids))
+
+
+class MatchIndex:
+    """Serves the last finished MatchRankings; one background thread updates them."""
+
+    def __init__(self, top_k):
+        self.top_k = top_k
+        self.rankings = MatchRankings(top_k)
+        self.lock = threading.Lock()
+        self.thread = None
+        self.built_at = None
+        self.checked_at = 0.0
+        self.dirty_workers = set()
+
+    @property
+    def top_jobs(self):
+        return self.rankings.top_jobs
+
+    @property
+    def top_workers(self):
+        return self.rankings.top_workers
+
+    def refresh(self):
+        """Start bringing the rankings up to date, at most every MATCH_REFRESH_SECONDS.
+
+        Returns at once; the work runs on the match thread.
+        """
+        if time.monotonic() - self.checked_at < MATCH_REFRESH_SECONDS:
+            return
+        with self.lock:
+            if self.thread is not None and self.thread.is_alive():
+                return
+            if time.monotonic() - self.checked_at < MATCH_REFRESH_SECONDS:
+                return
+            self.checked_at = time.monotonic()
+            # Started here, not at import, so each gunicorn worker gets its own
+            self.thread = threading.Thread(target=self.run, name="match-index", daemon=True)
+            self.thread.start()
+
+    def run(self):
+        started = time.monotonic()
+        with self.lock:
+            # Workers marked from now on are picked up by the next update
+            dirty, self.dirty_workers = self.dirty_workers, set()
+        with app.app_context():
+            try:
+                if self.built_at is None or started - self.built_at > MATCH_REBUILD_SECONDS:
+                    # Built on the side and swapped in whole
+                    rankings = MatchRankings(self.top_k)
+                    rankings.build()
+                    self.rankings = rankings
+                    self.built_at = started
+                else:
+                    self.rankings.update(dirty)
+            except Exception as e:
+                print("⚠️ Could not refresh the match index:", e)
+                # A half-applied update is replaced by a full rebuild next time
+                self.built_at = None
+
+    def mark_stale(self, worker_id=None):
+        """Refresh on the next read (this process); worker_id also rescans that worker."""
+        if worker_id is not None:
+            with self.lock:
+                self.dirty_workers.add(worker_id)
+        self.checked_at = 0.0
+
+
+match_index = MatchIndex(MATCH_TOP_K)
+
+
 # ===================== HOME =====================
 @app.route("/")
 def home():
@@ -177,6 +2115,221 @@ def logintype():
     return render_template("LoginHomePage.html")
 
 
+# ===================== PASSWORDS =====================
+# Passwords are stored as bcrypt hashes. bcrypt is slow on purpose, so it
+# runs in a pool of PASSWORD_HASH_WORKERS threads (bcrypt releases the GIL
+# while hashing) and at most PASSWORD_HASH_QUEUE more requests may wait for
+# a thread; past that, login/signup answer 503 instead of queueing behind
+# the CPU. Rows from before hashing hold the plain password; they, and
+# hashes made with fewer than BCRYPT_ROUNDS rounds, are rehashed on the
+# next successful login.
+BCRYPT_ROUNDS = int(os.environ.get("BCRYPT_ROUNDS", 12))
+PASSWORD_HASH_WORKERS = int(os.environ.get("PASSWORD_HASH_WORKERS", os.cpu_count() or 1))
+PASSWORD_HASH_QUEUE = int(os.environ.get("PASSWORD_HASH_QUEUE", 16))
+
+password_pool = ThreadPoolExecutor(PASSWORD_HASH_WORKERS, thread_name_prefix="password")
+password_slots = threading.BoundedSemaphore(PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE)
+
+
+class PasswordPoolBusy(Exception):
+    """Every password hashing slot is taken."""
+
+
+@app.errorhandler(PasswordPoolBusy)
+def password_pool_busy(e):
+    return "Too many sign-ins right now, please try again in a moment", 503
+
+
+def run_in_password_pool(fn, *args):
+    if not password_slots.acquire(blocking=False):
+        raise PasswordPoolBusy()
+    # The slot is held until the hash finishes, even if the request gave up
+    future = password_pool.submit(fn, *args)
+    future.add_done_callback(lambda _: password_slots.release())
+    return future.result()
+
+
+def password_bytes(password):
+    # bcrypt only uses the first 72 bytes (and bcrypt>=5 refuses longer input)
+    return password.encode("utf-8")[:72]
+
+
+def is_password_hash(stored):
+    return stored.startswith(("$2a$", "$2b$", "$2y$"))
+
+
+def hash_password(password):
+    return run_in_password_pool(
+        lambda: bcrypt.hashpw(password_bytes(password), bcrypt.gensalt(BCRYPT_ROUNDS)).decode()
+    )
+
+
+_dummy_password_hash = None
+
+
+def dummy_password_check(password):
+    """Spend the time of a real check, for an email with no account."""
+    global _dummy_password_hash
+    if _dummy_password_hash is None:
+        _dummy_password_hash = run_in_password_pool(
+            lambda: bcrypt.hashpw(b"no account", bcrypt.gensalt(BCRYPT_ROUNDS))
+        )
+    run_in_password_pool(bcrypt.checkpw, password_bytes(password), _dummy_password_hash)
+
+
+def check_password(account, password):
+    """True if password is right for a Worker/Company row (or None).
+
+    On success a plain or weaker stored password is replaced with a current
+    hash; the caller commits. Unknown accounts and plain stored passwords
+    still cost one bcrypt check, so response times don't tell which emails
+    have an account.
+    """
+    if account is None:
+        dummy_password_check(password)
+        return False
+
+    stored = account.password or ""
+    if is_password_hash(stored):
+        ok = run_in_password_pool(bcrypt.checkpw, password_bytes(password), stored.encode())
+        # "$2b$12$..." -> 12
+        outdated = int(stored.split("$")[2]) < BCRYPT_ROUNDS
+    else:
+        dummy_password_check(password)
+        ok = hmac.compare_digest(stored.encode("utf-8"), password.encode("utf-8"))
+        outdated = True
+
+    if ok and outdated:
+        account.password = hash_password(password)
+    return ok
+
+
+# ===================== RATE LIMITING =====================
+# login/signup attempts take a token from a per-IP and a per-account
+# bucket before touching the database; an empty bucket means 429 with a
+# Retry-After header. Limits are "<burst>/<seconds>": up to <burst>
+# attempts at once, refilled evenly over <seconds>.
+#
+# Backends (like the cache above):
+#   RATE_LIMIT_URL unset      -> MemoryBuckets, per process
+#   RATE_LIMIT_URL=redis://.. -> SharedBuckets on Redis, one bucket for all workers
+#   RATE_LIMIT_URL=local://   -> MemoryBuckets too (no Redis to run the script on)
+RATE_LIMIT_PER_IP = os.environ.get("RATE_LIMIT_PER_IP", "30/60")
+RATE_LIMIT_PER_ACCOUNT = os.environ.get("RATE_LIMIT_PER_ACCOUNT", "10/300")
+RATE_LIMIT_MAX_KEYS = int(os.environ.get("RATE_LIMIT_MAX_KEYS", 100000))
+
+# Same steps as refill_bucket(), atomically inside Redis
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local tokens = tonumber(state[1]) or capacity
+local updated_at = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + (now - updated_at) * rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated_at', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(tokens)}
+"""
+
+
+def parse_rate(spec):
+    """"30/60" -> (30 tokens, 0.5 tokens per second)."""
+    burst, seconds = spec.split("/")
+    return int(burst), int(burst) / float(seconds)
+
+
+def refill_bucket(tokens, updated_at, now, capacity, rate):
+    """Return (allowed, tokens left) after refilling and taking one token."""
+    tokens = min(capacity, tokens + (now - updated_at) * rate)
+    if tokens >= 1:
+        return True, tokens - 1
+    return False, tokens
+
+
+class MemoryBuckets:
+    """Token buckets in this process.
+
+    A bucket idle long enough to be full again is the same as no bucket,
+    so it is dropped (like the EXPIRE in the Redis script); past max_keys
+    the least recently used ones go too.
+    """
+
+    def __init__(self, max_keys):
+        self.max_keys = max_keys
+        # key -> (tokens, updated_at, full_at), least recently used first
+        self.buckets = OrderedDict()
+        self.lock = threading.Lock()
+
+    def take(self, key, capacity, rate):
+        now = time.monotonic()
+        with self.lock:
+            tokens, updated_at, _ = self.buckets.get(key, (capacity, now, now))
+            allowed, tokens = refill_bucket(tokens, updated_at, now, capacity, rate)
+            self.buckets[key] = (tokens, now, now + (capacity - tokens) / rate)
+            self.buckets.move_to_end(key)
+            while self.buckets:
+                oldest = next(iter(self.buckets.values()))
+                if oldest[2] > now and len(self.buckets) <= self.max_keys:
+                    break
+                self.buckets.popitem(last=False)
+        return allowed, tokens
+
+
+class SharedBuckets:
+    """Token buckets in a store shared by all workers (Redis or a stand-in)."""
+
+    def __init__(self, client):
+        self.script = client.register_script(TOKEN_BUCKET_SCRIPT)
+
+    def take(self, key, capacity, rate):
+        try:
+            allowed, tokens = self.script(keys=[key], args=[capacity, rate])
+        except Exception as e:
+            # Don't lock everyone out because the limiter store is down
+            print("RATE LIMIT ERROR:", e)
+            return True, capacity
+        return bool(int(allowed)), float(tokens)
+
+
+def make_rate_buckets(url):
+    if not url:
+        return MemoryBuckets(RATE_LIMIT_MAX_KEYS)
+    if url.startswith("local://"):
+        return MemoryBuckets(RATE_LIMIT_MAX_KEYS)
+
+    import redis  # optional, only needed for shared rate limits
+    return SharedBuckets(redis.Redis.from_url(url))
+
+
+rate_buckets = make_rate_buckets(os.environ.get("RATE_LIMIT_URL"))
+
+
+def rate_limit(action, account=None):
+    """429 response if this IP or account is out of attempts for action, else None.
+
+    Call it before any query so rejected attempts cost no database work.
+    """
+    checks = [(f"rate:{action}:ip:{request.remote_addr}", RATE_LIMIT_PER_IP)]
+    if account:
+        checks.append((f"rate:{action}:account:{account.strip().lower()}", RATE_LIMIT_PER_ACCOUNT))
+
+    for key, spec in checks:
+        capacity, rate = parse_rate(spec)
+        allowed, tokens = rate_buckets.take(key, capacity, rate)
+        if not allowed:
+            response = make_response("Too many attempts, please try again later", 429)
+            response.headers["Retry-After"] = str(math.ceil((1 - tokens) / rate))
+            return response
+    return None
+
+
 # ===================== SIGNUP =====================
 @app.route("/signup", methods=["GET", "POST"])
 def signup():
@@ -188,6 +2341,10 @@ def signup():
     password = request.form.get("password")
     phone_no = request.form.get("phone_no")
 
+    limited = rate_limit("signup", email)
+    if limited:
+        return limited
+
     if not all([username, email, password, phone_no]):
         return "All fields are required", 400
 
@@ -199,7 +2356,7 @@ def signup():
     worker = Worker(
         username=username,
         email=email,
-        password=password,
+        password=hash_password(password),
         phone_no=phone_no
     )
 
@@ -231,6 +2388,10 @@ def businesssignup():
     company_address = request.form.get("company_address")
     company_website = request.form.get("company_website")
 
+    limited = rate_limit("signup", email)
+    if limited:
+        return limited
+
     # ---------- VALIDATION ----------
     if not all([
         email, password, company_name,
@@ -247,7 +2408,7 @@ def businesssignup():
     # ---------- CREATE COMPANY ----------
     company = Company(
         email=email,
-        password=password,  # (hash later)
+        password=hash_password(password),
         company_name=company_name,
         company_category=company_category,
         company_location=company_location,
@@ -282,10 +2443,15 @@ def login():
     email = request.form.get("email")
     password = request.form.get("password")
 
+    limited = rate_limit("login", email)
+    if limited:
+        return limited
+
     # ---------- WORKER LOGIN ----------
     if user_type == "worker":
         worker = Worker.query.filter_by(email=email).first()
-        if worker and worker.password == password:
+        if check_password(worker, password or ""):
+            db.session.commit()
             session["worker_id"] = worker.id
             session["user_type"] = "worker"
             return redirect(url_for("workerprofile"))
@@ -293,7 +2459,8 @@ def login():
     # ---------- COMPANY LOGIN ----------
     if user_type == "company":
         company = Company.query.filter_by(email=email).first()
-        if company and company.password == password:
+        if check_password(company, password or ""):
+            db.session.commit()
             session["company_id"] = company.id
             session["user_type"] = "company"
             return redirect(url_for("companyprofile"))
@@ -308,16 +2475,27 @@ def workerprofile():
     if session.get("user_type") != "worker":
         return redirect(url_for("login"))
 
-    worker = Worker.query.get(session["worker_id"])
+    worker = current_identity()
+    if not worker:
+        return redirect(url_for("login"))
 
-    applications = Application.query.filter_by(
-        worker_id=worker.id
-    ).all()
+    # Load each application's job in the same query (template shows job title)
+    query = Application.query.options(
+        db.joinedload(Application.job)
+    ).filter_by(
+        worker_id=worker["id"]
+    )
+    applications, next_cursor = keyset_page(
+        query, Application.application_id,
+        request.args.get("after", type=int), PROFILE_PAGE_SIZE
+    )
 
     return render_template(
         "worker-profile.html",
         worker=worker,
-        applications=applications
+        applications=applications,
+        total_applications=worker_application_count(worker["id"]),
+        next_cursor=next_cursor
     )
 @app.route("/worker/upload-documents", methods=["POST"])
 def upload_worker_documents():
@@ -328,29 +2506,26 @@ def upload_worker_documents():
     if not worker:
         return redirect(url_for("logintype"))
 
-    upload_folder = "static/uploads"
-    os.makedirs(upload_folder, exist_ok=True)
+    # Files were already streamed to disk and hashed while the form was parsed
+    stored = []
 
     # -------- AADHAR --------
     aadhar = request.files.get("aadhar_card")
     if aadhar and aadhar.filename:
-        aadhar_filename = f"{uuid.uuid4()}_{secure_filename(aadhar.filename)}"
-        aadhar.save(os.path.join(upload_folder, aadhar_filename))
-        worker.aadhar_card = aadhar_filename
+        set_worker_document(worker, "aadhar_card", store_document(aadhar))
+        stored.append(worker.aadhar_card)
 
     # -------- PAN --------
     pan = request.files.get("pan_card")
     if pan and pan.filename:
-        pan_filename = f"{uuid.uuid4()}_{secure_filename(pan.filename)}"
-        pan.save(os.path.join(upload_folder, pan_filename))
-        worker.pan_card = pan_filename
+        set_worker_document(worker, "pan_card", store_document(pan))
+        stored.append(worker.pan_card)
 
     # -------- RESUME --------
     resume = request.files.get("resume")
     if resume and resume.filename:
-        resume_filename = f"{uuid.uuid4()}_{secure_filename(resume.filename)}"
-        resume.save(os.path.join(upload_folder, resume_filename))
-        worker.resume = resume_filename
+        set_worker_document(worker, "resume", store_document(resume))
+        stored.append(worker.resume)
 
     # -------- KYC STATUS --------
     if worker.aadhar_card and worker.pan_card:
@@ -359,6 +2534,12 @@ def upload_worker_documents():
 
 
     db.session.commit()
+    forget_identity()
+
+    # Sniffing, page counts and thumbnails happen off the request
+    for filename in stored:
+        enqueue_document(filename)
+
     flash("Document uploaded successfully.", "success")
 
     return redirect(url_for("workerprofile"))
@@ -395,6 +2576,7 @@ def update_worker_profile():
         worker.phone_no = data.get("phone_no", worker.phone_no)
 
         db.session.commit()
+        forget_identity()
 
         return jsonify(
             success=True,
@@ -407,6 +2589,63 @@ def update_worker_profile():
         print("UPDATE ERROR:", e)
         return jsonify(success=False, message=str(e))
 
+def load_job_page(filters, after, after_score):
+    """One page of /jobportal results as cacheable dicts, plus the next cursor.
+
+    The cursor is a job_id, or a (job_id, score) pair for search results.
+    """
+    # Filter in SQL instead of loading the whole job_post table
+    conditions = []
+    if filters["location"]:
+        conditions.append(JobPOST.job_location == filters["location"])
+    if filters["category"]:
+        conditions.append(JobPOST.job_category == filters["category"])
+    if filters["shift"]:
+        conditions.append(JobPOST.job_shift == filters["shift"])
+
+    # Salary ranges overlap the wanted range; open-ended ("15k+") jobs count
+    if filters["salary_min"] is not None:
+        conditions.append(db.or_(
+            JobPOST.salary_max >= filters["salary_min"],
+            db.and_(JobPOST.salary_max.is_(None), JobPOST.salary_min.isnot(None))
+        ))
+    if filters["salary_max"] is not None:
+        conditions.append(db.or_(
+            JobPOST.salary_min <= filters["salary_max"],
+            db.and_(JobPOST.salary_min.is_(None), JobPOST.salary_max <= filters["salary_max"])
+        ))
+    if filters["max_experience"] is not None:
+        conditions.append(JobPOST.experience_min <= filters["max_experience"])
+
+    hits = job_search_hits(filters["q"]) if filters["q"] else None
+    if hits is not None:
+        # Best matches first: rank, apply the cursor and cut the page in the
+        # search statement itself. job_post is joined there only when a
+        # filter needs its columns; otherwise just the page's rows are read.
+        key_column = hits.c.job_id
+        if conditions:
+            # Keyed on job_post so SQLite checks the cursor (and so scores
+            # the row) only after the filters passed
+            key_column = JobPOST.job_id
+        ranked = db.select(key_column, hits.c.score)
+        if conditions:
+            ranked = ranked.join(JobPOST, JobPOST.job_id == hits.c.job_id).where(*conditions)
+        job_ids, next_cursor = ranked_page(
+            ranked, hits.c.score, key_column, after, after_score, JOBS_PER_PAGE
+        )
+        jobs_by_id = {
+            job.job_id: job for job in JobPOST.query.filter(JobPOST.job_id.in_(job_ids))
+        } if job_ids else {}
+        jobs = [jobs_by_id[job_id] for job_id in job_ids if job_id in jobs_by_id]
+    else:
+        # Newest jobs first, one fixed-size page at a time
+        jobs, next_cursor = keyset_page(
+            JobPOST.query.filter(*conditions), JobPOST.job_id, after, JOBS_PER_PAGE
+        )
+
+    return [row_to_dict(job) for job in jobs], next_cursor
+
+
 @app.route("/jobportal")
 def jobportal():
     role = session.get("user_type") 
@@ -420,9 +2659,54 @@ def jobportal():
     if role != "worker":
         return redirect(url_for("dashboard"))
 
-    # Fetch all jobs from database
-    jobs = JobPOST.query.all()
-    return render_template("job-portal.html", jobs=jobs)
+    filters = {
+        "location": request.args.get("location", "").strip(),
+        "category": request.args.get("category", "").strip(),
+        "shift": request.args.get("shift", "").strip(),
+        "q": request.args.get("q", "").strip(),
+        "salary_min": request.args.get("salary_min", type=int),
+        "salary_max": request.args.get("salary_max", type=int),
+        "max_experience": request.args.get("max_experience", type=float),
+    }
+    after = request.args.get("after", type=int)
+    after_score = request.args.get("score", type=float)
+
+    cache_key = f"portal:{sorted(filters.items())}:{after}:{after_score}"
+    jobs, next_cursor = cache.get_or_load(
+        "jobs", cache_key, lambda: load_job_page(filters, after, after_score)
+    )
+
+    # Keep the active filters on the "next page" link
+    active_filters = {key: value for key, value in filters.items() if value not in (None, "")}
+    next_url = None
+    if isinstance(next_cursor, tuple):
+        next_url = url_for(
+            "jobportal", after=next_cursor[0], score=repr(next_cursor[1]),
+            **active_filters
+        )
+    elif next_cursor:
+        next_url = url_for("jobportal", after=next_cursor, **active_filters)
+
+    return render_template(
+        "job-portal.html",
+        jobs=jobs,
+        filters=filters,
+        next_url=next_url,
+        first_url=url_for("jobportal", **active_filters) if after else None
+    )
+
+
+def load_job(job_id):
+    """Cacheable dict of one job with its company name ({} if missing)."""
+    job = JobPOST.query.options(db.joinedload(JobPOST.company)).filter_by(
+        job_id=job_id
+    ).first()
+    if not job:
+        return {}
+
+    data = row_to_dict(job)
+    data["company_name"] = job.company.company_name if job.company else None
+    return data
 
 
 @app.route("/apply", methods=["GET", "POST"])
@@ -485,7 +2769,13 @@ def applyjob():
         )
 
         db.session.add(application)
-        db.session.commit()
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # Lost a race with a double-submit; the unique index caught it
+            db.session.rollback()
+            return "You have already applied for this job", 400
+        match_index.mark_stale()
 
         # Redirect to worker profile with success
         return redirect(url_for("workerprofile"))
@@ -495,32 +2785,63 @@ def applyjob():
         return redirect(url_for("jobportal"))
 
     # Get job details
-    job = JobPOST.query.get(job_id)
+    job = cache.get_or_load("jobs", f"job:{job_id}", lambda: load_job(job_id))
     if not job:
         return "Job not found", 404
 
     return render_template("apply-job.html", job=job)
 
 
+@app.route("/jobs/recommended")
+def recommended_jobs():
+    """Best matching jobs for the logged-in worker, from the match index."""
+    if session.get("user_type") != "worker":
+        return jsonify(success=False, message="Unauthorized"), 401
+
+    match_index.refresh()
+    ranking = match_index.top_jobs.get(session["worker_id"], [])
+
+    # Jobs they already applied to are not recommendations
+    applied = {job_id for (job_id,) in db.session.query(Application.job_id).filter(
+        Application.worker_id == session["worker_id"],
+        Application.job_id.in_([job_id for job_id, _ in ranking])
+    )}
+    jobs = []
+    for job_id, score in ranking:
+        if job_id in applied:
+            continue
+        job = cache.get_or_load("jobs", f"job:{job_id}", lambda: load_job(job_id))
+        if job:
+            jobs.append(dict(job, score=score))
+
+    return jsonify(success=True, jobs=jobs)
+
+
 # ===================== BUSINESS ROUTES =====================
 @app.route("/companyprofile")
 def companyprofile():
     if session.get("user_type") != "company":
         return redirect(url_for("login"))
 
-    company = Company.query.get(session["company_id"])
-
-    jobs = JobPOST.query.filter_by(company_id=company.id).all()
-    sell_items = sellitem.query.filter_by(
-        posted_by=company.email
-    ).order_by(sellitem.sell_date.desc()).all()
+    company = current_identity()
+    if not company:
+        return redirect(url_for("login"))
 
-    buy_items = buyitem.query.filter_by(
-        posted_by=company.email
-    ).order_by(buyitem.buy_date.desc()).all()
+    total_jobs_posted, total_b2b_listings = company_counts(company)
 
-    
-    total_b2b_listings = len(sell_items) + len(buy_items)
+    # Only one window of each list, newest first
+    jobs, jobs_next = keyset_page(
+        JobPOST.query.filter_by(company_id=company["id"]),
+        JobPOST.job_id, request.args.get("jobs_after", type=int), PROFILE_PAGE_SIZE
+    )
+    sell_items, sell_next = keyset_page(
+        sellitem.query.filter_by(posted_by=company["email"]),
+        sellitem.sell_id, request.args.get("sell_after", type=int), PROFILE_PAGE_SIZE
+    )
+    buy_items, buy_next = keyset_page(
+        buyitem.query.filter_by(posted_by=company["email"]),
+        buyitem.buy_id, request.args.get("buy_after", type=int), PROFILE_PAGE_SIZE
+    )
 
     return render_template(
         "company-profile.html",
@@ -528,8 +2849,12 @@ def companyprofile():
         jobs=jobs,
         sell_items=sell_items,
         buy_items=buy_items,
-        total_jobs_posted=len(jobs),
-        total_b2b_listings=total_b2b_listings
+        total_jobs_posted=total_jobs_posted,
+        total_b2b_listings=total_b2b_listings,
+        application_counts=application_status_counts([job.job_id for job in jobs]),
+        jobs_next=jobs_next,
+        sell_next=sell_next,
+        buy_next=buy_next
     )
 
 @app.route("/company/update-profile", methods=["POST"])
@@ -549,7 +2874,16 @@ def update_company_profile():
     company.company_address = data.get("company_address", company.company_address)
     company.company_location = data.get("company_location", company.company_location)
 
+    # Company name is part of every job's search document
+    renamed = db.inspect(company).attrs.company_name.history.has_changes()
+    if renamed:
+        for job in company.jobs:
+            index_job(job)
+
     db.session.commit()
+    forget_identity()
+    if renamed:
+        cache.invalidate("jobs")
 
     return jsonify(
         success=True,
@@ -561,27 +2895,135 @@ def update_company_profile():
     )
 
 
+JOB_FIELDS = [
+    "job_title", "job_category", "job_location", "job_specific_location",
+    "job_experience", "job_shift", "job_salary", "job_contact", "job_description",
+]
+BULK_IMPORT_BATCH_SIZE = 500
+
+
+def validate_job_fields(data):
+    """Return an error message for a job posting, or None if it is valid.
+
+    Shared by the job form and the bulk import so both apply the same rules.
+    """
+    missing = [field for field in JOB_FIELDS if not (data.get(field) or "").strip()]
+    if missing:
+        return "Missing required fields: " + ", ".join(missing)
+    if len(data["job_title"]) > 80:
+        return "job_title must be at most 80 characters"
+    if not re.fullmatch(r"\d{10}", data["job_contact"].strip()):
+        return "job_contact must be a 10-digit phone number"
+    return None
+
+
+def read_bulk_rows():
+    """Yield (row_number, dict) from a CSV or JSON-lines upload, one at a time.
+
+    Accepts the file as the raw request body or as a multipart "file" field
+    and never reads the whole file into memory.
+    """
+    upload = request.files.get("file")
+    if upload:
+        stream, name, content_type = upload.stream, upload.filename or "", upload.content_type or ""
+    else:
+        stream, name, content_type = request.stream, "", request.content_type or ""
+
+    data_format = request.args.get("format")
+    if not data_format:
+        is_jsonl = "json" in content_type or name.endswith((".jsonl", ".ndjson"))
+        data_format = "jsonl" if is_jsonl else "csv"
+
+    lines = io.TextIOWrapper(io.BufferedReader(stream), encoding="utf-8-sig", newline="")
+    if data_format == "jsonl":
+        for row_number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                yield row_number, f"Invalid JSON: {e}"
+                continue
+            yield row_number, row if isinstance(row, dict) else "Each line must be a JSON object"
+    else:
+        for row_number, row in enumerate(csv.DictReader(lines), start=1):
+            yield row_number, row
+
+
+@app.route("/jobpost/bulk", methods=["POST"])
+def bulk_jobpost():
+    """Import many job postings from CSV or JSON lines.
+
+    Columns/keys are the job form field names. Valid rows are inserted in
+    batches of BULK_IMPORT_BATCH_SIZE, one transaction per batch; the
+    response lists every rejected row with its row number and reason.
+    """
+    if session.get("user_type") != "company":
+        return jsonify(success=False, message="Unauthorized"), 401
+
+    company_id = session["company_id"]
+    inserted = 0
+    errors = []
+    batch = []
+
+    def flush_batch():
+        nonlocal inserted
+        if not batch:
+            return
+        jobs = [job for _, job in batch]
+        try:
+            db.session.add_all(jobs)
+            db.session.flush()
+            index_jobs(jobs)
+            db.session.commit()
+            inserted += len(jobs)
+        except Exception as e:
+            db.session.rollback()
+            errors.extend({"row": row_number, "error": f"Database error: {e}"} for row_number, _ in batch)
+        batch.clear()
+
+    for row_number, row in read_bulk_rows():
+        if isinstance(row, str):
+            errors.append({"row": row_number, "error": row})
+            continue
+
+        data = {field: str(row.get(field) or "").strip() for field in JOB_FIELDS}
+        error = validate_job_fields(data)
+        if error:
+            errors.append({"row": row_number, "error": error})
+            continue
+
+        batch.append((row_number, JobPOST(company_id=company_id, **data)))
+        if len(batch) >= BULK_IMPORT_BATCH_SIZE:
+            flush_batch()
+    flush_batch()
+
+    if inserted:
+        cache.invalidate("jobs")
+        match_index.mark_stale()
+
+    return jsonify(success=not errors, inserted=inserted, errors=errors)
+
+
 @app.route("/jobpost", methods=["GET", "POST"])
 def jobpost():
     if session.get("user_type") != "company":
         return redirect(url_for("login"))
 
     if request.method == "POST":
-        job = JobPOST(
-            company_id=session["company_id"],
-            job_title=request.form.get("job_title"),
-            job_category=request.form.get("job_category"),
-            job_location=request.form.get("job_location"),
-            job_specific_location=request.form.get("job_specific_location"),
-            job_experience=request.form.get("job_experience"),
-            job_shift=request.form.get("job_shift"),
-            job_salary=request.form.get("job_salary"),
-            job_contact=request.form.get("job_contact"),
-            job_description=request.form.get("job_description"),
-        )
+        data = {field: request.form.get(field) or "" for field in JOB_FIELDS}
+        error = validate_job_fields(data)
+        if error:
+            return error, 400
+
+        job = JobPOST(company_id=session["company_id"], **data)
 
         db.session.add(job)
+        db.session.flush()
+        index_job(job)
         db.session.commit()
+        cache.invalidate("jobs")
+        match_index.mark_stale()
         return redirect(url_for("companyprofile"))
 
     return render_template("post-job.html")
@@ -606,7 +3048,10 @@ def application():
         if not job or job.company_id != company_id:
             return "Job not found or unauthorized", 404
 
-        applications = Application.query.filter_by(job_id=job_id).order_by(
+        applications = Application.query.options(
+            db.joinedload(Application.job),
+            db.joinedload(Application.worker)
+        ).filter_by(job_id=job_id).order_by(
             Application.application_date.desc()
         ).all()
 
@@ -620,7 +3065,10 @@ def application():
     # ---------- SHOW ALL APPLICATIONS ----------
     if business_jobs:
         job_ids = [job.job_id for job in business_jobs]
-        applications = Application.query.filter(
+        applications = Application.query.options(
+            db.joinedload(Application.job),
+            db.joinedload(Application.worker)
+        ).filter(
             Application.job_id.in_(job_ids)
         ).order_by(Application.application_date.desc()).all()
     else:
@@ -633,44 +3081,391 @@ def application():
         all_jobs=business_jobs
     )
 
+EXPORT_COLUMNS = [
+    ("application_id", Application.application_id),
+    ("job_id", Application.job_id),
+    ("job_title", JobPOST.job_title),
+    ("applicant_name", Application.applicant_name),
+    ("applicant_email", Application.applicant_email),
+    ("applicant_phone", Application.applicant_phone),
+    ("applicant_age", Application.applicant_age),
+    ("applicant_gender", Application.applicant_gender),
+    ("applicant_skill", Application.applicant_skill),
+    ("applicant_experience", Application.applicant_experience),
+    ("applicant_expected_salary", Application.applicant_expected_salary),
+    ("applicant_location", Application.applicant_location),
+    ("applicant_preferred_shift", Application.applicant_preferred_shift),
+    ("applicant_status", Application.applicant_status),
+    ("application_date", Application.application_date),
+]
+EXPORT_BATCH_SIZE = 1000
+
+
+@app.route("/application/export")
+def export_applications():
+    """Stream this company's applications as CSV (default) or JSON lines.
+
+    Optional filters: job_id, status, from / to (YYYY-MM-DD, inclusive).
+    Rows are fetched through a server-side cursor in batches and written
+    out as they arrive, so memory stays flat however many rows there are.
+    """
+    if session.get("user_type") != "company":
+        return redirect(url_for("dashboard"))
+
+    data_format = request.args.get("format", "csv")
+    if data_format not in ("csv", "jsonl"):
+        return "format must be csv or jsonl", 400
+
+    query = db.select(*[column for _, column in EXPORT_COLUMNS]).join(
+        JobPOST, JobPOST.job_id == Application.job_id
+    ).where(
+        JobPOST.company_id == session["company_id"]
+    )
+
+    job_id = request.args.get("job_id", type=int)
+    if job_id:
+        query = query.where(Application.job_id == job_id)
+    status = request.args.get("status")
+    if status:
+        query = query.where(Application.applicant_status == status)
+    try:
+        if request.args.get("from"):
+            start = datetime.strptime(request.args["from"], "%Y-%m-%d")
+            query = query.where(Application.application_date >= start)
+        if request.args.get("to"):
+            end = datetime.strptime(request.args["to"], "%Y-%m-%d") + timedelta(days=1)
+            query = query.where(Application.application_date < end)
+    except ValueError:
+        return "Dates must be YYYY-MM-DD", 400
+
+    query = query.order_by(Application.application_id).execution_options(
+        stream_results=True, yield_per=EXPORT_BATCH_SIZE
+    )
+    names = [name for name, _ in EXPORT_COLUMNS]
+
+    def generate():
+        result = db.session.execute(query)
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if data_format == "csv":
+            writer.writerow(names)
+
+        for rows in result.partitions():
+            for row in rows:
+                if data_format == "csv":
+                    writer.writerow(row)
+                else:
+                    buffer.write(json.dumps(dict(zip(names, row)), default=str) + "\n")
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        yield buffer.getvalue()
+
+    filename = f"applications.{data_format}"
+    return app.response_class(
+        stream_with_context(generate()),
+        mimetype="text/csv" if data_format == "csv" else "application/x-ndjson",
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
+
+
+APPLICATION_DECISIONS = ["selected", "rejected"]
+MAX_BULK_STATUS_IDS = 5000
+
+
+def set_application_status(company_id, status, application_ids=None, job_id=None, current_status=None):
+    """Set applicant_status on this company's matching applications.
+
+    Ownership is part of the WHERE clause (job_id IN the company's jobs), so
+    the check and the write are one set-based UPDATE. Returns the ids that
+    were updated; other companies' applications never match.
+    """
+    conditions = [Application.job_id.in_(
+        db.select(JobPOST.job_id).where(JobPOST.company_id == company_id)
+    )]
+    if application_ids is not None:
+        conditions.append(Application.application_id.in_(application_ids))
+    if job_id:
+        conditions.append(Application.job_id == job_id)
+    if current_status:
+        conditions.append(Application.applicant_status == current_status)
+
+    statement = db.update(Application).where(*conditions).values(applicant_status=status)
+    options = {"synchronize_session": False}
+
+    if db.engine.dialect.update_returning:
+        updated = db.session.execute(
+            statement.returning(Application.application_id), execution_options=options
+        ).scalars().all()
+    else:
+        # e.g. MySQL: no UPDATE ... RETURNING, read the ids in the same transaction
+        updated = db.session.execute(
+            db.select(Application.application_id).where(*conditions).with_for_update()
+        ).scalars().all()
+        db.session.execute(statement, execution_options=options)
+
+    db.session.commit()
+    return updated
+
+
+@app.route("/company/update-application-status/bulk", methods=["POST"])
+def bulk_update_application_status():
+    """Set one status on many applications at once.
+
+    JSON body: {"status": "selected" | "rejected"} plus either
+    "application_ids": [...] or "filter": {"job_id": ..., "status": ...}.
+    Returns per-id outcomes ("updated" / "not_found") for an id list, or the
+    updated ids for a filter.
+    """
+    if session.get("user_type") != "company":
+        return jsonify(success=False, message="Unauthorized")
+
+    data = request.get_json(silent=True) or {}
+    status = data.get("status")
+    if status not in APPLICATION_DECISIONS:
+        return jsonify(success=False, message="Invalid status")
+
+    application_ids = data.get("application_ids")
+    filters = data.get("filter")
+
+    if application_ids is not None:
+        if not isinstance(application_ids, list) or len(application_ids) > MAX_BULK_STATUS_IDS:
+            return jsonify(success=False, message=f"application_ids must be a list of at most {MAX_BULK_STATUS_IDS} ids")
+        try:
+            application_ids = {int(app_id) for app_id in application_ids}
+        except (TypeError, ValueError):
+            return jsonify(success=False, message="application_ids must be integers")
+
+        updated = set(set_application_status(
+            session["company_id"], status, application_ids=application_ids
+        ))
+        results = {
+            str(app_id): "updated" if app_id in updated else "not_found"
+            for app_id in sorted(application_ids)
+        }
+        return jsonify(success=True, updated=len(updated), results=results)
+
+    if isinstance(filters, dict) and filters.get("job_id"):
+        try:
+            job_id = int(filters["job_id"])
+        except (TypeError, ValueError):
+            return jsonify(success=False, message="filter.job_id must be an integer")
+        current_status = filters.get("status")
+        if current_status is not None and not isinstance(current_status, str):
+            return jsonify(success=False, message="filter.status must be a string")
+
+        updated = set_application_status(
+            session["company_id"], status,
+            job_id=job_id, current_status=current_status
+        )
+        return jsonify(success=True, updated=len(updated), application_ids=sorted(updated))
+
+    return jsonify(success=False, message="Send application_ids or a filter with job_id")
+
+
 @app.route("/company/update-application-status", methods=["POST"])
 def update_application_status():
     if session.get("user_type") != "company":
         return jsonify(success=False, message="Unauthorized")
 
-    data = request.get_json()
+    data = request.get_json(silent=True) or {}
     app_id = data.get("application_id")
     status = data.get("status")
 
-    if status not in ["selected", "rejected"]:
+    if status not in APPLICATION_DECISIONS:
         return jsonify(success=False, message="Invalid status")
 
-    application = Application.query.get(app_id)
-    if not application:
+    try:
+        app_id = int(app_id)
+    except (TypeError, ValueError):
         return jsonify(success=False, message="Application not found")
 
-    application.applicant_status = status
-    db.session.commit()
+    # One UPDATE that only matches applications to this company's jobs
+    if not set_application_status(session["company_id"], status, application_ids=[app_id]):
+        return jsonify(success=False, message="Application not found")
 
     return jsonify(success=True)
 
 
+@app.route("/company/jobs/<int:job_id>/candidates")
+def job_candidates(job_id):
+    """Best matching workers for one of the company's jobs, from the match index."""
+    if session.get("user_type") != "company":
+        return jsonify(success=False, message="Unauthorized"), 401
+
+    owned = db.session.query(JobPOST.job_id).filter_by(
+        job_id=job_id, company_id=session["company_id"]
+    ).first()
+    if not owned:
+        return jsonify(success=False, message="Job not found"), 404
+
+    match_index.refresh()
+    ranking = match_index.top_workers.get(job_id, [])
+    worker_ids = [worker_id for worker_id, _ in ranking]
+
+    names = dict(db.session.query(Worker.id, Worker.username).filter(Worker.id.in_(worker_ids)))
+    applications = dict(db.session.query(Application.worker_id, Application.application_id).filter(
+        Application.job_id == job_id, Application.worker_id.in_(worker_ids)
+    ))
+    candidates = [{
+        "worker_id": worker_id,
+        "username": names.get(worker_id),
+        "score": score,
+        "application_id": applications.get(worker_id)
+    } for worker_id, score in ranking]
+
+    return jsonify(success=True, job_id=job_id, candidates=candidates)
+
+
 @app.route("/cancel_application/<int:app_id>", methods=["POST"])
 def cancel_application(app_id):
     if session.get("user_type") != "worker":
         return redirect(url_for("dashboard"))
 
-    application = Application.query.get_or_404(app_id)
-
+    # Only the applicant can cancel, and only while pending: both checks are
+    # part of the DELETE itself
+    result = db.session.execute(
+        db.delete(Application).where(
+            Application.application_id == app_id,
+            Application.worker_id == session.get("worker_id"),
+            Application.applicant_status == "pending"
+        ),
+        execution_options={"synchronize_session": False}
+    )
+    db.session.commit()
 
-    # Only allow cancel if pending
-    if application.applicant_status != "pending":
+    if not result.rowcount:
+        # Failure path only: tell "not yours / missing" from "not pending"
+        owned = db.session.query(Application.application_id).filter_by(
+            application_id=app_id, worker_id=session.get("worker_id")
+        ).first()
+        if not owned:
+            abort(404)
         return "Cannot cancel this application", 400
 
-    db.session.delete(application)
+    # Their profile may now come from an older application
+    match_index.mark_stale(session.get("worker_id"))
+    return redirect(url_for("workerprofile"))
+
+
+# ===================== MARKET MATCHING =====================
+# A sell item matches a buy requirement from another company in the same
+# category when the price fits the budget (no budget = negotiable). Matches
+# are stored in market_match when a listing is posted, at most
+# MARKET_MATCH_LIMIT per new listing, best first.
+MARKET_MATCH_LIMIT = int(os.environ.get("MARKET_MATCH_LIMIT", 50))
+MARKET_MATCHES_PER_PAGE = 50
+
+
+def market_match_score(budget, location, own_location):
+    """SQL score of a compatible pair (category already equal).
+
+    `budget` is the buy requirement's budget and `location` the other
+    listing's location (columns or values); `own_location` is the new
+    listing's. Computed in the query so only the best MARKET_MATCH_LIMIT
+    rows ever leave the database.
+    """
+    score = db.literal(2.0)
+    if own_location and own_location != "Not specified":
+        score = score + db.case((location == own_location, 1.0), else_=0.0)
+    # A stated budget the price fits beats "negotiable"
+    if budget is None or isinstance(budget, (int, float)):
+        return score + (1.0 if budget is not None else 0.5)
+    return score + db.case((budget.is_(None), 0.5), else_=1.0)
+
+
+def store_market_matches(candidates, id_column):
+    """Insert the best MARKET_MATCH_LIMIT rows of a (sell_id, buy_id, score)
+    select straight into market_match; ties go to the newest listing."""
+    best = (
+        candidates.add_columns(db.literal(datetime.utcnow(), db.DateTime).label("created_at"))
+        .order_by(db.desc("score"), id_column.desc())
+        .limit(MARKET_MATCH_LIMIT)
+    )
+    db.session.execute(
+        MarketMatch.__table__.insert().from_select(["sell_id", "buy_id", "score", "created_at"], best)
+    )
+
+
+def match_sell_item(item):
+    """Record the open buy requirements a new (flushed) sell item fits."""
+    store_market_matches(
+        db.select(
+            db.literal(item.sell_id).label("sell_id"),
+            buyitem.buy_id,
+            market_match_score(buyitem.buy_budget, buyitem.buy_location, item.sell_location).label("score")
+        )
+        .where(
+            buyitem.buy_category == item.sell_category,
+            buyitem.buy_status == "open",
+            buyitem.posted_by != item.posted_by,
+            db.or_(buyitem.buy_budget.is_(None), buyitem.buy_budget >= item.sell_price)
+        ),
+        buyitem.buy_id
+    )
+
+
+def match_buy_item(item):
+    """Record the available sell items that fit a new (flushed) buy requirement."""
+    query = (
+        db.select(
+            sellitem.sell_id,
+            db.literal(item.buy_id).label("buy_id"),
+            market_match_score(item.buy_budget, sellitem.sell_location, item.buy_location).label("score")
+        )
+        .where(
+            sellitem.sell_category == item.buy_category,
+            sellitem.sell_status == "available",
+            sellitem.posted_by != item.posted_by
+        )
+    )
+    if item.buy_budget is not None:
+        query = query.where(sellitem.sell_price <= item.buy_budget)
+    store_market_matches(query, sellitem.sell_id)
+
+
+def load_market_matches(email):
+    """Cacheable matches for one company: buyers for its sell items and
+    sellers for its buy requirements, best first."""
+    mine = db.aliased(sellitem)
+    buyers = db.session.execute(
+        db.select(MarketMatch.score, MarketMatch.sell_id, buyitem)
+        .join(mine, mine.sell_id == MarketMatch.sell_id)
+        .join(buyitem, buyitem.buy_id == MarketMatch.buy_id)
+        .where(mine.posted_by == email, mine.sell_status == "available", buyitem.buy_status == "open")
+        .order_by(MarketMatch.score.desc(), MarketMatch.created_at.desc())
+        .limit(MARKET_MATCHES_PER_PAGE)
+    ).all()
+
+    mine = db.aliased(buyitem)
+    sellers = db.session.execute(
+        db.select(MarketMatch.score, MarketMatch.buy_id, sellitem)
+        .join(mine, mine.buy_id == MarketMatch.buy_id)
+        .join(sellitem, sellitem.sell_id == MarketMatch.sell_id)
+        .where(mine.posted_by == email, mine.buy_status == "open", sellitem.sell_status == "available")
+        .order_by(MarketMatch.score.desc(), MarketMatch.created_at.desc())
+        .limit(MARKET_MATCHES_PER_PAGE)
+    ).all()
+
+    return (
+        [dict(row_to_dict(item), score=score, for_sell_id=sell_id) for score, sell_id, item in buyers],
+        [dict(row_to_dict(item), score=score, for_buy_id=buy_id) for score, buy_id, item in sellers],
+    )
+
+
+def rebuild_market_matches():
+    """Recompute market_match from scratch (after an import or a scoring change)."""
+    db.session.execute(db.delete(MarketMatch))
+    for item in sellitem.query.filter_by(sell_status="available").order_by(sellitem.sell_id):
+        match_sell_item(item)
     db.session.commit()
 
-    return redirect(url_for("workerprofile"))
+
+@app.cli.command("match-market")
+def match_market_command():
+    """Rebuild the stored buyer/seller matches."""
+    rebuild_market_matches()
+    print("✅ Market matches rebuilt")
 
 
 # ===================== B2B (OPTIONAL BUSINESS PAGES) =====================
@@ -707,10 +3502,9 @@ def b2bpost():
             return "All required fields must be filled", 400
 
         # ---------- PRICE CLEAN ----------
-        price_match = re.search(r'[\d.]+', sell_price_raw.replace(',', ''))
-        if not price_match:
+        sell_price = parse_number_range(sell_price_raw)[0]
+        if sell_price is None:
             return "Invalid price format", 400
-        sell_price = float(price_match.group())
 
         # ---------- QUANTITY CLEAN ----------
         qty_match = re.search(r'\d+', sell_quantity_raw)
@@ -728,33 +3522,148 @@ def b2bpost():
             sell_description=sell_description,
             sell_image=sell_image,
             sell_status="available",
-            posted_by=Company.query.get(session["company_id"]).email
+            posted_by=current_identity()["email"]
         )
 
         db.session.add(sell_item)
+        db.session.flush()
+        match_sell_item(sell_item)
         db.session.commit()
+        cache.invalidate("market")
 
         return redirect(url_for("companyprofile"))
 
     return render_template("b2b-post.html")
 
 
+MARKET_PER_PAGE = 20
+
+
+def sell_conditions(filters):
+    """WHERE clauses for available sell items matching the marketplace filters."""
+    conditions = [sellitem.sell_status == "available"]
+    if filters["category"]:
+        conditions.append(sellitem.sell_category == filters["category"])
+    if filters["location"]:
+        conditions.append(sellitem.sell_location == filters["location"])
+    if filters["price_min"] is not None:
+        conditions.append(sellitem.sell_price >= filters["price_min"])
+    if filters["price_max"] is not None:
+        conditions.append(sellitem.sell_price <= filters["price_max"])
+    return conditions
+
+
+def buy_conditions(filters):
+    """WHERE clauses for open buy requirements matching the marketplace filters.
+
+    A price filter applies to the budget; "negotiable" (no budget) is left out.
+    """
+    conditions = [buyitem.buy_status == "open"]
+    if filters["category"]:
+        conditions.append(buyitem.buy_category == filters["category"])
+    if filters["location"]:
+        conditions.append(buyitem.buy_location == filters["location"])
+    if filters["price_min"] is not None:
+        conditions.append(buyitem.buy_budget >= filters["price_min"])
+    if filters["price_max"] is not None:
+        conditions.append(buyitem.buy_budget <= filters["price_max"])
+    return conditions
+
+
+def load_market(filters, sell_after, buy_after):
+    """Cacheable page of each marketplace list, newest first, plus next cursors."""
+    sell_items, sell_next = keyset_page(
+        sellitem.query.filter(*sell_conditions(filters)),
+        sellitem.sell_id, sell_after, MARKET_PER_PAGE
+    )
+    buy_items, buy_next = keyset_page(
+        buyitem.query.filter(*buy_conditions(filters)),
+        buyitem.buy_id, buy_after, MARKET_PER_PAGE
+    )
+    return (
+        [row_to_dict(item) for item in sell_items], sell_next,
+        [row_to_dict(item) for item in buy_items], buy_next,
+    )
+
+
+def load_market_facets(filters):
+    """Listings (sell + buy) per category and per location, most first.
+
+    Each facet is counted with the other filters applied but not its own,
+    so picking a category still shows what the other categories hold.
+    """
+    facets = {}
+    for facet in ("category", "location"):
+        others = dict(filters, **{facet: ""})
+        counts = Counter()
+        # One grouped query per table; each is an index-only scan
+        for column, conditions in (
+            (getattr(sellitem, f"sell_{facet}"), sell_conditions(others)),
+            (getattr(buyitem, f"buy_{facet}"), buy_conditions(others)),
+        ):
+            rows = db.session.execute(
+                db.select(column, db.func.count()).where(*conditions).group_by(column)
+            )
+            counts.update({value: total for value, total in rows if value})
+        facets[facet] = counts.most_common()
+    return facets
+
+
 @app.route("/b2bbuy")
 def buyerlist():
     if session.get("user_type") != "company":
         return redirect(url_for("dashboard"))
 
-    # Fetch all available sell items
-    sell_items = sellitem.query.filter_by(sell_status="available").order_by(
-        sellitem.sell_date.desc()
-    ).all()
+    filters = {
+        "category": request.args.get("category", "").strip(),
+        "location": request.args.get("location", "").strip(),
+        "price_min": request.args.get("price_min", type=float),
+        "price_max": request.args.get("price_max", type=float),
+    }
+    sell_after = request.args.get("sell_after", type=int)
+    buy_after = request.args.get("buy_after", type=int)
+
+    filter_key = sorted(filters.items())
+    sell_items, sell_next, buy_items, buy_next = cache.get_or_load(
+        "market", f"page:{filter_key}:{sell_after}:{buy_after}",
+        lambda: load_market(filters, sell_after, buy_after)
+    )
+    facets = cache.get_or_load(
+        "market", f"facets:{filter_key}", lambda: load_market_facets(filters)
+    )
+
+    # Each list pages on its own cursor; links keep the filters and the other cursor
+    active_filters = {key: value for key, value in filters.items() if value not in (None, "")}
+    sell_next_url = url_for(
+        "buyerlist", sell_after=sell_next, buy_after=buy_after, **active_filters
+    ) if sell_next else None
+    buy_next_url = url_for(
+        "buyerlist", sell_after=sell_after, buy_after=buy_next, **active_filters
+    ) if buy_next else None
+
+    return render_template(
+        "buyer-list.html",
+        sell_items=sell_items,
+        buy_items=buy_items,
+        filters=filters,
+        facets=facets,
+        sell_next_url=sell_next_url,
+        buy_next_url=buy_next_url,
+        first_url=url_for("buyerlist", **active_filters) if sell_after or buy_after else None
+    )
 
-    # Fetch all open buy requirements
-    buy_items = buyitem.query.filter_by(buy_status="open").order_by(
-        buyitem.buy_date.desc()
-    ).all()
 
-    return render_template("buyer-list.html", sell_items=sell_items, buy_items=buy_items)
+@app.route("/b2b/matches")
+def market_matches():
+    """Counterparties matched to the logged-in company's listings."""
+    if session.get("user_type") != "company":
+        return jsonify(success=False, message="Unauthorized"), 401
+
+    email = current_identity()["email"]
+    buyers, sellers = cache.get_or_load(
+        "market", f"matches:{email}", lambda: load_market_matches(email)
+    )
+    return jsonify(success=True, buyers=buyers, sellers=sellers)
 
 
 @app.route("/hostseller", methods=["GET", "POST"])
@@ -784,13 +3693,9 @@ def hostseller():
             else:
                 return "Invalid quantity format. Please enter a number.", 400
 
-            # Convert budget if provided
-            budget_float = None
-            if buy_budget and buy_budget.strip().lower() not in ['negotiable', 'na', '']:
-                budget_str = buy_budget.replace('₹', '').replace(',', '').replace(' ', '').strip()
-                budget_match = re.search(r'[\d.]+', budget_str)
-                if budget_match:
-                    budget_float = float(budget_match.group())
+            # Convert budget if provided ("Negotiable" parses to None)
+            budget_low, budget_high = parse_number_range(buy_budget)
+            budget_float = budget_high if budget_high is not None else budget_low
 
         except (ValueError, AttributeError):
             return "Invalid quantity or budget format", 400
@@ -804,11 +3709,15 @@ def hostseller():
             buy_budget=budget_float,
             buy_description=buy_description,
             buy_image=buy_image,
-            posted_by=session.get("user", "unknown")
+            # Same owner key as sell items, so the company finds its matches
+            posted_by=current_identity()["email"]
         )
 
         db.session.add(buy_item)
+        db.session.flush()
+        match_buy_item(buy_item)
         db.session.commit()
+        cache.invalidate("market")
 
         # Redirect to B2B home with success
         return redirect(url_for("b2bhome"))
@@ -824,9 +3733,63 @@ def logout():
 
 
 # ===================== DATABASE INITIALIZATION =====================
+def ensure_columns():
+    """Add columns declared on the models to tables that already exist.
+
+    Like ensure_indexes() below, this lets an existing site.db pick up new
+    model columns with ALTER TABLE ... ADD COLUMN instead of a rebuild.
+    New columns must be nullable or have a server_default.
+    """
+    inspector = db.inspect(db.engine)
+    for table in db.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+
+            ddl = (
+                f"ALTER TABLE {table.name} ADD COLUMN {column.name} "
+                f"{column.type.compile(db.engine.dialect)}"
+            )
+            if column.server_default is not None:
+                ddl += f" DEFAULT '{column.server_default.arg}'"
+                if not column.nullable:
+                    ddl += " NOT NULL"
+            db.session.execute(text(ddl))
+    db.session.commit()
+
+
+def ensure_indexes():
+    """Add indexes declared on the models to tables that already exist.
+
+    db.create_all() only creates missing tables, so an existing site.db
+    never gets indexes added to the models later. This creates each missing
+    index in place (CREATE INDEX), no rebuild or data copy needed.
+    """
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            try:
+                index.create(bind=db.engine, checkfirst=True)
+            except (IntegrityError, OperationalError) as e:
+                # e.g. old duplicate applications block the unique index
+                print(f"⚠️ Could not create index {index.name}:", e.orig)
+
+
 # Create all database tables if they don't exist
 with app.app_context():
     db.create_all()
+    ensure_columns()
+    ensure_indexes()
+    # Jobs/applications from before the numeric columns or the current
+    # parser: without this every salary or experience filter would miss them
+    backfilled = backfill_numeric_columns()
+    if backfilled:
+        print(f"✅ Parsed numeric columns for {backfilled} existing row(s)")
+    init_search_index()
+    migrate_legacy_uploads()
     print("✅ Database tables created/verified successfully!")
 
 
@@ -0,0 +1,138 @@
+"""Measure /jobportal reads per second while /apply writes are running.
+
+Seeds a throwaway SQLite database, then runs --readers processes that
+keep loading /jobportal (listing cache off) next to --writers processes
+that keep applying to jobs. Each process has its own connections, like
+gunicorn workers. Compare the journal modes:
+
+    python benchmarks/concurrent_reads.py --journal-mode DELETE --synchronous FULL
+    python benchmarks/concurrent_reads.py                      # WAL / NORMAL
+
+Usage:
+    python benchmarks/concurrent_reads.py [--readers 4] [--writers 2]
+        [--seconds 5] [--journal-mode WAL] [--synchronous NORMAL]
+"""
+import argparse
+import logging
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--readers", type=int, default=4)
+parser.add_argument("--writers", type=int, default=2)
+parser.add_argument("--seconds", type=float, default=5)
+parser.add_argument("--jobs", type=int, default=2000)
+parser.add_argument("--journal-mode", default="WAL")
+parser.add_argument("--synchronous", default="NORMAL")
+args = parser.parse_args()
+
+DB_DIR = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(DB_DIR, 'bench.db')}"
+os.environ["SQLITE_JOURNAL_MODE"] = args.journal_mode
+os.environ["SQLITE_SYNCHRONOUS"] = args.synchronous
+os.environ["CACHE_TTL"] = "0"  # every read goes to the database
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as webapp  # noqa: E402
+from app import Company, JobPOST, Worker, db  # noqa: E402
+
+
+def seed():
+    """One company with --jobs jobs, one worker per reader/writer process."""
+    with webapp.app.app_context():
+        company = Company(
+            email="company@example.com", password="x", company_name="Acme",
+            company_category="Manufacturing", company_location="Chakan MIDC",
+            company_contact="9999999999", company_address="MIDC"
+        )
+        db.session.add(company)
+        db.session.flush()
+        db.session.add_all(
+            Worker(username=f"worker{i}", password="x", email=f"worker{i}@example.com",
+                   phone_no="9999999999")
+            for i in range(args.readers + args.writers)
+        )
+        db.session.add_all(
+            JobPOST(
+                company_id=company.id, job_title=f"Operator {i}", job_category="Machine Operator",
+                job_location="Chakan MIDC", job_specific_location="Gate 3",
+                job_experience="Fresher", job_shift="Day Shift", job_salary="15000",
+                job_contact="9999999999", job_description="CNC machine operation"
+            )
+            for i in range(args.jobs)
+        )
+        db.session.commit()
+        return [worker.id for worker in Worker.query.order_by(Worker.id)]
+
+
+def run(role, worker_id, deadline, results):
+    with webapp.app.app_context():
+        db.engine.dispose(close=False)  # don't share the parent's connections
+    logging.getLogger(webapp.app.name).disabled = True
+    client = webapp.app.test_client()
+    with client.session_transaction() as session:
+        session["user_type"] = "worker"
+        session["worker_id"] = worker_id
+
+    done, errors, latencies = 0, 0, []
+    job_id = 1
+    while time.time() < deadline:
+        start = time.perf_counter()
+        if role == "read":
+            response = client.get("/jobportal")
+            ok = response.status_code == 200
+        else:
+            response = client.post("/apply", data={
+                "job_id": job_id, "applicant_name": "A", "applicant_email": "a@example.com",
+                "applicant_phone": "9999999999", "applicant_age": 25, "applicant_gender": "M",
+                "applicant_skill": "Welding", "applicant_experience": "1 year",
+                "applicant_expected_salary": "15000", "applicant_location": "Chakan MIDC",
+                "applicant_preferred_shift": "Day Shift",
+            })
+            ok = response.status_code == 302
+            job_id = job_id % args.jobs + 1
+        latencies.append(time.perf_counter() - start)
+        if ok:
+            done += 1
+        else:
+            errors += 1
+    results.put((role, done, errors, latencies))
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))] if values else 0
+
+
+def main():
+    worker_ids = seed()
+    results = multiprocessing.Queue()
+    deadline = time.time() + args.seconds
+    roles = ["read"] * args.readers + ["write"] * args.writers
+    processes = [
+        multiprocessing.Process(target=run, args=(role, worker_id, deadline, results))
+        for role, worker_id in zip(roles, worker_ids)
+    ]
+    for process in processes:
+        process.start()
+    totals = {"read": [0, 0, []], "write": [0, 0, []]}
+    for _ in processes:
+        role, done, errors, latencies = results.get()
+        totals[role][0] += done
+        totals[role][1] += errors
+        totals[role][2].extend(latencies)
+    for process in processes:
+        process.join()
+
+    print(f"journal_mode={args.journal_mode} synchronous={args.synchronous} "
+          f"readers={args.readers} writers={args.writers}")
+    for role, (done, errors, latencies) in totals.items():
+        print(f"{role}s: {done / args.seconds:.1f}/s, {errors} failed, "
+              f"p50={percentile(latencies, 50) * 1000:.1f}ms p95={percentile(latencies, 95) * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
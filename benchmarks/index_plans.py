@@ -0,0 +1,150 @@
+"""Before/after benchmark for the indexes declared on the models.
+
+Seeds a throwaway SQLite database, then runs the hot filter queries from
+app.py twice: once with the indexes dropped (what an old site.db looks
+like) and once after ensure_indexes() has added them back. For each query
+it prints the SQLite query plan and the average time per query.
+
+Usage:
+    python benchmarks/index_plans.py [--jobs 20000] [--applications 200000]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Point the app at a scratch database before it is imported
+DB_DIR = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(DB_DIR, 'bench.db')}"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text  # noqa: E402
+
+import app as webapp  # noqa: E402
+from app import Application, JobPOST, buyitem, db, sellitem  # noqa: E402
+
+
+def seed(n_companies, n_workers, n_jobs, n_applications, n_listings):
+    rng = random.Random(42)
+    now = datetime.utcnow()
+
+    db.session.execute(webapp.Company.__table__.insert(), [
+        dict(email=f"company{i}@example.com", password="x", company_name=f"Company {i}",
+             company_category="Manufacturing", company_location="Chakan MIDC",
+             company_contact="9999999999", company_address="MIDC")
+        for i in range(1, n_companies + 1)
+    ])
+    db.session.execute(webapp.Worker.__table__.insert(), [
+        dict(username=f"worker{i}", password="x", email=f"worker{i}@example.com",
+             phone_no="9999999999")
+        for i in range(1, n_workers + 1)
+    ])
+    db.session.execute(JobPOST.__table__.insert(), [
+        dict(company_id=rng.randint(1, n_companies), job_title="Machine Operator",
+             job_category="Machine Operator", job_location="Chakan MIDC",
+             job_specific_location="Gate 3", job_experience="Fresher",
+             job_shift="Day Shift", job_salary="₹12,000 – ₹18,000",
+             job_contact="9999999999", job_description="CNC machine operation")
+        for _ in range(n_jobs)
+    ])
+
+    pairs = set()
+    while len(pairs) < n_applications:
+        pairs.add((rng.randint(1, n_jobs), rng.randint(1, n_workers)))
+    db.session.execute(Application.__table__.insert(), [
+        dict(job_id=job_id, worker_id=worker_id, applicant_name="A",
+             applicant_email="a@example.com", applicant_phone="9999999999",
+             applicant_age=25, applicant_gender="M", applicant_skill="Welding",
+             applicant_experience="1 year", applicant_expected_salary="15000",
+             applicant_location="Chakan MIDC", applicant_preferred_shift="Day Shift",
+             application_date=now - timedelta(minutes=rng.randint(0, 100000)))
+        for job_id, worker_id in pairs
+    ])
+
+    db.session.execute(sellitem.__table__.insert(), [
+        dict(sell_name="Steel sheets", sell_price=100.0, sell_quantity=10,
+             sell_description="Cold rolled", sell_status=rng.choice(["available", "sold"]),
+             sell_date=now - timedelta(minutes=i),
+             posted_by=f"company{rng.randint(1, n_companies)}@example.com")
+        for i in range(n_listings)
+    ])
+    db.session.execute(buyitem.__table__.insert(), [
+        dict(buy_name="Steel sheets", buy_budget=100.0, buy_quantity=10,
+             buy_description="Cold rolled", buy_status=rng.choice(["open", "closed"]),
+             buy_date=now - timedelta(minutes=i),
+             posted_by=f"company{rng.randint(1, n_companies)}@example.com")
+        for i in range(n_listings)
+    ])
+    db.session.commit()
+
+
+def hot_queries():
+    """The filter queries app.py runs on every page view, as ORM queries."""
+    return {
+        "workerprofile: applications of a worker":
+            Application.query.filter_by(worker_id=7),
+        "application(): applications of a job, newest first":
+            Application.query.filter_by(job_id=7).order_by(Application.application_date.desc()),
+        "applyjob(): duplicate application check":
+            Application.query.filter_by(job_id=7, worker_id=7),
+        "companyprofile: jobs of a company":
+            JobPOST.query.filter_by(company_id=7),
+        "companyprofile: sell items of a company":
+            sellitem.query.filter_by(posted_by="company7@example.com").order_by(sellitem.sell_date.desc()),
+        "b2b: available sell items of a company":
+            sellitem.query.filter_by(posted_by="company7@example.com", sell_status="available")
+            .order_by(sellitem.sell_date.desc()),
+        "companyprofile: buy items of a company":
+            buyitem.query.filter_by(posted_by="company7@example.com").order_by(buyitem.buy_date.desc()),
+    }
+
+
+def compile_sql(query):
+    return str(query.statement.compile(db.engine, compile_kwargs={"literal_binds": True}))
+
+
+def run(label, repeat):
+    print(f"\n===== {label} =====")
+    for name, query in hot_queries().items():
+        sql = compile_sql(query)
+        plan = db.session.execute(text("EXPLAIN QUERY PLAN " + sql)).all()
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            db.session.execute(text(sql)).all()
+        elapsed_ms = (time.perf_counter() - start) / repeat * 1000
+
+        print(f"{name}: {elapsed_ms:.3f} ms")
+        for row in plan:
+            print("    " + row[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--companies", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=20000)
+    parser.add_argument("--jobs", type=int, default=20000)
+    parser.add_argument("--applications", type=int, default=200000)
+    parser.add_argument("--listings", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    with webapp.app.app_context():
+        seed(args.companies, args.workers, args.jobs, args.applications, args.listings)
+
+        indexes = [index for table in db.metadata.sorted_tables for index in table.indexes]
+        for index in indexes:
+            index.drop(bind=db.engine)
+        db.session.execute(text("ANALYZE"))
+        run("BEFORE (no indexes)", args.repeat)
+
+        webapp.ensure_indexes()
+        db.session.execute(text("ANALYZE"))
+        run("AFTER (ensure_indexes)", args.repeat)
+
+
+if __name__ == "__main__":
+    main()
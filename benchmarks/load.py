@@ -0,0 +1,392 @@
+"""Load-test the main routes and fail if they got slower than the baseline.
+
+Seeds a throwaway SQLite database with benchmarks/seed.py (or uses
+--database, which must already be seeded), then sends --requests
+requests to each route from --threads threads and reports p50/p95/p99
+latency and throughput:
+
+    jobportal       GET  /jobportal with random filters, as a worker
+    apply           POST /apply, a fresh worker applying to a popular job
+    application     GET  /application?job_id=..., as the job's company
+    applications    GET  /application, all of a company's applications
+    companyprofile  GET  /companyprofile
+    b2bbuy          GET  /b2bbuy with random filters, as a company
+    upload          POST /worker/upload-documents with a 100 KB resume
+
+By default requests go through Flask's test client in this process. With
+--gunicorn the script starts `gunicorn app:app` on --port with the same
+database and sends real HTTP requests; sessions are signed with the app's
+secret key instead of logging in, so bcrypt does not dominate.
+
+The results are compared with --baseline for the same mode, --rows and
+--threads; the script exits with status 1 if any route fails requests,
+or its p95 or throughput is more than --tolerance (default 50%) worse.
+--write-baseline stores this run as the new baseline instead.
+
+Usage:
+    python benchmarks/load.py [--rows 10000] [--requests 200] [--threads 4]
+        [--gunicorn] [--gunicorn-workers 2] [--routes jobportal,apply]
+        [--database URL] [--write-baseline] [--tolerance 0.5]
+"""
+import argparse
+import http.client
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+import uuid
+
+ROUTES = ["jobportal", "apply", "application", "applications", "companyprofile", "b2bbuy", "upload"]
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--rows", type=int, default=10000, help="seed size when --database is not given")
+parser.add_argument("--database", help="already seeded DATABASE_URL to test against")
+parser.add_argument("--requests", type=int, default=200, help="timed requests per route")
+parser.add_argument("--warmup", type=int, default=10, help="untimed requests per route first")
+parser.add_argument("--threads", type=int, default=4)
+parser.add_argument("--routes", default=",".join(ROUTES))
+parser.add_argument("--seed", type=int, default=42)
+parser.add_argument("--gunicorn", action="store_true", help="drive a local gunicorn over HTTP")
+parser.add_argument("--gunicorn-workers", type=int, default=2)
+parser.add_argument("--port", type=int, default=8765)
+parser.add_argument("--baseline", default=os.path.join(BENCH_DIR, "baseline.json"))
+parser.add_argument("--write-baseline", action="store_true")
+parser.add_argument("--tolerance", type=float, default=0.5)
+args = parser.parse_args()
+
+WORK_DIR = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = args.database or f"sqlite:///{os.path.join(WORK_DIR, 'load.db')}"
+os.environ["UPLOAD_FOLDER"] = os.path.join(WORK_DIR, "uploads")
+os.environ.setdefault("FLASK_SECRET_KEY", uuid.uuid4().hex)
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+import app as webapp  # noqa: E402
+from app import Application, Company, JobPOST, Worker, db  # noqa: E402
+from seed import JOB_CATEGORIES, LOCATIONS, MARKET_CATEGORIES, SHIFTS, Zipf, seed_database  # noqa: E402
+
+
+# ===================== SCENARIOS =====================
+# Each scenario returns (method, path, user, form, files); user is the
+# ("worker" | "company", id) the request is logged in as.
+
+class Scenarios:
+    def __init__(self, rng):
+        self.rng = rng
+        with webapp.app.app_context():
+            self.worker_ids = [row.id for row in db.session.query(Worker.id)]
+            self.company_ids = [row.id for row in db.session.query(Company.id)]
+            self.jobs = [(row.job_id, row.company_id)
+                         for row in db.session.query(JobPOST.job_id, JobPOST.company_id)]
+            # Jobs ordered by applications, so Zipf draws hit the busy ones
+            busy = dict(db.session.query(Application.job_id, db.func.count())
+                        .group_by(Application.job_id))
+        self.jobs.sort(key=lambda job: -busy.get(job[0], 0))
+        self.popular_job = Zipf(rng, len(self.jobs), s=0.9)
+        self.apply_workers = []
+
+    def add_apply_workers(self, count):
+        """Fresh workers for /apply, so no request hits the duplicate check."""
+        run = uuid.uuid4().hex[:8]
+        with webapp.app.app_context():
+            rows = [dict(username=f"load-{run}-{i}", password="x", phone_no="9999999999",
+                         email=f"load-{run}-{i}@example.com", kyc_status="pending")
+                    for i in range(count)]
+            db.session.execute(db.insert(Worker.__table__), rows)
+            db.session.commit()
+            self.apply_workers = [row.id for row in db.session.query(Worker.id).filter(
+                Worker.username.like(f"load-{run}-%"))]
+
+    def worker(self):
+        return ("worker", self.rng.choice(self.worker_ids))
+
+    def maybe(self, options):
+        return self.rng.choice(options) if self.rng.random() < 0.5 else ""
+
+    def jobportal(self, i):
+        query = {"location": self.maybe(LOCATIONS), "category": self.maybe(JOB_CATEGORIES),
+                 "shift": self.maybe(SHIFTS)}
+        query = urllib.parse.urlencode({key: value for key, value in query.items() if value})
+        return "GET", f"/jobportal?{query}", self.worker(), None, None
+
+    def apply(self, i):
+        job_id, _ = self.jobs[self.popular_job()]
+        form = {
+            "job_id": job_id, "applicant_name": "Load Test", "applicant_email": "load@example.com",
+            "applicant_phone": "9999999999", "applicant_age": 25, "applicant_gender": "Male",
+            "applicant_skill": "Welding", "applicant_experience": "2 years",
+            "applicant_expected_salary": "15000-18000", "applicant_location": self.rng.choice(LOCATIONS),
+            "applicant_preferred_shift": self.rng.choice(SHIFTS),
+        }
+        return "POST", "/apply", ("worker", self.apply_workers[i]), form, None
+
+    def application(self, i):
+        job_id, company_id = self.jobs[self.popular_job()]
+        return "GET", f"/application?job_id={job_id}", ("company", company_id), None, None
+
+    def applications(self, i):
+        _, company_id = self.jobs[self.popular_job()]
+        return "GET", "/application", ("company", company_id), None, None
+
+    def companyprofile(self, i):
+        return "GET", "/companyprofile", ("company", self.rng.choice(self.company_ids)), None, None
+
+    def b2bbuy(self, i):
+        query = {"category": self.maybe(MARKET_CATEGORIES), "location": self.maybe(LOCATIONS)}
+        if self.rng.random() < 0.25:
+            query["price_max"] = self.rng.randrange(10, 500) * 1000
+        query = urllib.parse.urlencode({key: value for key, value in query.items() if value})
+        return "GET", f"/b2bbuy?{query}", ("company", self.rng.choice(self.company_ids)), None, None
+
+    def upload(self, i):
+        # Random bytes, so every upload is a new blob like a real resume
+        content = b"%PDF-1.4\n" + self.rng.randbytes(100 * 1024)
+        return "POST", "/worker/upload-documents", self.worker(), None, {"resume": ("resume.pdf", content)}
+
+
+# ===================== CLIENTS =====================
+
+def session_data(user):
+    user_type, user_id = user
+    return {"user_type": user_type, f"{user_type}_id": user_id}
+
+
+class TestClient:
+    """One Flask test client per thread."""
+
+    def __init__(self):
+        self.client = webapp.app.test_client()
+
+    def prepare(self, user):
+        with self.client.session_transaction() as session:
+            session.clear()
+            session.update(session_data(user))
+
+    def send(self, method, path, form, files):
+        data = dict(form or {})
+        for field, (filename, content) in (files or {}).items():
+            data[field] = (io.BytesIO(content), filename)
+        return self.client.open(path, method=method, data=data or None).status_code
+
+    def close(self):
+        pass
+
+
+class HTTPClient:
+    """A keep-alive connection to gunicorn, with a signed session cookie."""
+
+    serializer = webapp.app.session_interface.get_signing_serializer(webapp.app)
+    cookie_name = webapp.app.config["SESSION_COOKIE_NAME"]
+
+    def __init__(self):
+        self.connection = http.client.HTTPConnection("127.0.0.1", args.port, timeout=60)
+        self.cookie = ""
+
+    def prepare(self, user):
+        self.cookie = f"{self.cookie_name}={self.serializer.dumps(session_data(user))}"
+
+    def send(self, method, path, form, files):
+        headers = {"Cookie": self.cookie}
+        body = None
+        if files:
+            boundary = uuid.uuid4().hex
+            parts = []
+            for field, value in (form or {}).items():
+                parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{field}"\r\n\r\n'
+                             f'{value}\r\n'.encode())
+            for field, (filename, content) in files.items():
+                parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{field}"; '
+                             f'filename="{filename}"\r\nContent-Type: application/pdf\r\n\r\n'.encode()
+                             + content + b"\r\n")
+            body = b"".join(parts) + f"--{boundary}--\r\n".encode()
+            headers["Content-Type"] = f"multipart/form-data; boundary={boundary}"
+        elif form:
+            body = urllib.parse.urlencode(form).encode()
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+        self.connection.request(method, path, body=body, headers=headers)
+        response = self.connection.getresponse()
+        response.read()
+        if response.getheader("Connection", "").lower() == "close":
+            self.connection.close()
+        return response.status
+
+    def close(self):
+        self.connection.close()
+
+
+def start_gunicorn():
+    process = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "app:app", "--bind", f"127.0.0.1:{args.port}",
+         "--workers", str(args.gunicorn_workers), "--worker-class", "gthread", "--threads", "4"],
+        cwd=REPO_DIR, env=os.environ.copy(),
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if process.poll() is not None:
+            sys.exit("gunicorn exited during startup")
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", args.port, timeout=5)
+            connection.request("GET", "/")
+            connection.getresponse().read()
+            connection.close()
+            return process
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    sys.exit("gunicorn did not start in 60s")
+
+
+# ===================== RUNNER =====================
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))] if values else 0
+
+
+def run_route(name, scenarios, make_client):
+    """Send the warmup and timed requests for one route; return its stats."""
+    scenario = getattr(scenarios, name)
+    planned = [scenario(i) for i in range(args.warmup + args.requests)]
+    warmup, timed = planned[:args.warmup], iter(planned[args.warmup:])
+    lock = threading.Lock()
+    latencies, errors = [], {}
+
+    client = make_client()
+    for method, path, user, form, files in warmup:
+        client.prepare(user)
+        client.send(method, path, form, files)
+    client.close()
+
+    # Redirects are what the form posts return on success
+    ok_statuses = {302} if planned[0][0] == "POST" else {200}
+
+    def run():
+        client = make_client()
+        while True:
+            with lock:
+                request = next(timed, None)
+            if request is None:
+                break
+            method, path, user, form, files = request
+            client.prepare(user)
+            start = time.perf_counter()
+            status = client.send(method, path, form, files)
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+                if status not in ok_statuses:
+                    errors[status] = errors.get(status, 0) + 1
+        client.close()
+
+    threads = [threading.Thread(target=run) for _ in range(args.threads)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    return {
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "rps": round(len(latencies) / elapsed, 1),
+        "errors": errors,
+    }
+
+
+def compare(results, baseline):
+    """Return the list of regressions against baseline (same mode/rows/threads)."""
+    failures = []
+    for name, result in results.items():
+        if result["errors"]:
+            failures.append(f"{name}: failed requests {result['errors']}")
+        base = baseline["routes"].get(name)
+        if not base:
+            continue
+        if result["p95_ms"] > base["p95_ms"] * (1 + args.tolerance):
+            failures.append(f"{name}: p95 {result['p95_ms']}ms, baseline {base['p95_ms']}ms")
+        if result["rps"] < base["rps"] / (1 + args.tolerance):
+            failures.append(f"{name}: {result['rps']} req/s, baseline {base['rps']} req/s")
+    return failures
+
+
+def main():
+    routes = [route for route in args.routes.split(",") if route]
+    unknown = set(routes) - set(ROUTES)
+    if unknown:
+        sys.exit(f"Unknown routes: {', '.join(sorted(unknown))}")
+    webapp.app.logger.disabled = True
+
+    if not args.database:
+        started = time.perf_counter()
+        with webapp.app.app_context():
+            seed_database(args.rows, args.seed, log=lambda line: None)
+        print(f"seeded {args.rows} rows in {time.perf_counter() - started:.1f}s")
+
+    scenarios = Scenarios(random.Random(args.seed))
+    if "apply" in routes:
+        scenarios.add_apply_workers(args.warmup + args.requests)
+
+    mode = "gunicorn" if args.gunicorn else "testclient"
+    server = start_gunicorn() if args.gunicorn else None
+    make_client = HTTPClient if args.gunicorn else TestClient
+    results = {}
+    try:
+        print(f"{mode}: {args.requests} requests per route, {args.threads} threads")
+        print(f"{'route':<16}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'req/s':>9}  errors")
+        for name in routes:
+            result = results[name] = run_route(name, scenarios, make_client)
+            print(f"{name:<16}{result['p50_ms']:>9}{result['p95_ms']:>9}{result['p99_ms']:>9}"
+                  f"{result['rps']:>9}  {result['errors'] or ''}")
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+    baselines = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baselines = json.load(f)
+
+    if args.write_baseline:
+        baselines[mode] = {
+            "rows": args.rows, "threads": args.threads, "requests": args.requests,
+            "routes": {name: {key: result[key] for key in ("p50_ms", "p95_ms", "p99_ms", "rps")}
+                       for name, result in results.items()},
+        }
+        with open(args.baseline, "w") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"wrote {mode} baseline to {args.baseline}")
+        return
+
+    baseline = baselines.get(mode)
+    if args.database:
+        print("--database given; not comparing with the baseline")
+        failures = compare(results, {"routes": {}})
+    elif not baseline or (baseline["rows"], baseline["threads"]) != (args.rows, args.threads):
+        print(f"no {mode} baseline for rows={args.rows} threads={args.threads}; not comparing")
+        failures = compare(results, {"routes": {}})
+    else:
+        failures = compare(results, baseline)
+
+    if failures:
+        print("REGRESSION:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+    print("ok")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Measure login requests per second, to size workers and BCRYPT_ROUNDS.
+
+Signs up --accounts workers through /signup on a throwaway SQLite
+database, then logs them in from --threads threads for --seconds and
+reports throughput and latency. Run it on a commit from before password
+hashing for the plaintext baseline; on later commits --rounds and
+--hash-workers set BCRYPT_ROUNDS and PASSWORD_HASH_WORKERS.
+
+Usage:
+    python benchmarks/login_throughput.py [--rounds 12] [--hash-workers 4]
+        [--threads 8] [--seconds 5] [--accounts 20]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--rounds", type=int, default=12)
+parser.add_argument("--hash-workers", type=int, default=os.cpu_count() or 1)
+parser.add_argument("--threads", type=int, default=8)
+parser.add_argument("--seconds", type=float, default=5)
+parser.add_argument("--accounts", type=int, default=20)
+args = parser.parse_args()
+
+DB_DIR = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(DB_DIR, 'bench.db')}"
+os.environ["BCRYPT_ROUNDS"] = str(args.rounds)
+os.environ["PASSWORD_HASH_WORKERS"] = str(args.hash_workers)
+# Measure bcrypt, not the login rate limiter
+os.environ["RATE_LIMIT_PER_IP"] = "1000000000/1"
+os.environ["RATE_LIMIT_PER_ACCOUNT"] = "1000000000/1"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as webapp  # noqa: E402
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def main():
+    client = webapp.app.test_client()
+    for i in range(args.accounts):
+        response = client.post("/signup", data={
+            "username": f"worker{i}", "email": f"worker{i}@example.com",
+            "password": f"secret-{i}", "phone_no": "9999999999",
+        })
+        assert response.status_code == 302, response.status_code
+
+    latencies = []
+    statuses = {}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + args.seconds
+
+    def run(offset):
+        client = webapp.app.test_client()
+        i = offset
+        while time.perf_counter() < deadline:
+            account = i % args.accounts
+            start = time.perf_counter()
+            response = client.post("/loginpage?user_type=worker", data={
+                "email": f"worker{account}@example.com", "password": f"secret-{account}",
+            })
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+            i += 1
+
+    threads = [threading.Thread(target=run, args=(n,)) for n in range(args.threads)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    ok = statuses.get(302, 0)
+    print(f"rounds={args.rounds} hash_workers={args.hash_workers} threads={args.threads}")
+    print(f"logins: {ok} ok in {elapsed:.1f}s = {ok / elapsed:.1f}/s  statuses={statuses}")
+    print(f"latency: p50={percentile(latencies, 50) * 1000:.1f}ms "
+          f"p95={percentile(latencies, 95) * 1000:.1f}ms "
+          f"p99={percentile(latencies, 99) * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""Check that list pages run a constant number of SELECTs.
+
+Seeds a throwaway SQLite database with a "light" and a "heavy" worker and
+company, requests each page as both, and compares the SELECT counts from
+the app's query counter (g.select_count). The caches are emptied before
+every request, so each count is the page's cold path. If the heavy
+account needs more SELECTs than the light one, some template is
+lazy-loading per row; if a page needs more than SELECT_BUDGET (default
+10, enforced by the app too), it has grown a query too many. Either way
+the script exits with status 1.
+
+Usage:
+    SELECT_BUDGET=10 python benchmarks/query_counts.py [--light 5] [--heavy 500]
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+DB_DIR = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(DB_DIR, 'bench.db')}"
+BUDGET = int(os.environ.get("SELECT_BUDGET") or 10)
+os.environ["SELECT_BUDGET"] = str(BUDGET)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import g  # noqa: E402
+
+import app as webapp  # noqa: E402
+from app import Application, Company, JobPOST, Worker, db  # noqa: E402
+
+
+def seed_account(n):
+    """One company with n jobs and one worker who applied to all of them."""
+    company = Company(
+        email=f"company{n}@example.com", password="x", company_name=f"Company {n}",
+        company_category="Manufacturing", company_location="Chakan MIDC",
+        company_contact="9999999999", company_address="MIDC"
+    )
+    worker = Worker(username=f"worker{n}", password="x",
+                    email=f"worker{n}@example.com", phone_no="9999999999")
+    db.session.add_all([company, worker])
+    db.session.flush()
+
+    for i in range(n):
+        job = JobPOST(
+            company_id=company.id, job_title=f"Operator {i}", job_category="Machine Operator",
+            job_location="Chakan MIDC", job_specific_location="Gate 3",
+            job_experience="Fresher", job_shift="Day Shift", job_salary="15000",
+            job_contact="9999999999", job_description="CNC machine operation"
+        )
+        db.session.add(job)
+        db.session.flush()
+        db.session.add(Application(
+            job_id=job.job_id, worker_id=worker.id, applicant_name="A",
+            applicant_email="a@example.com", applicant_phone="9999999999",
+            applicant_age=25, applicant_gender="M", applicant_skill="Welding",
+            applicant_experience="1 year", applicant_expected_salary="15000",
+            applicant_location="Chakan MIDC", applicant_preferred_shift="Day Shift"
+        ))
+    db.session.commit()
+    return worker.id, company.id
+
+
+def cold_caches():
+    """Empty the listing, card and identity caches so nothing is served from them."""
+    webapp.cache.invalidate("jobs", "market")
+    webapp.fragment_cache.invalidate(*webapp.CARD_TEMPLATES)
+    with webapp.identity_cache.lock:
+        webapp.identity_cache.entries.clear()
+
+
+def count_selects(client, path):
+    cold_caches()
+    with client:
+        response = client.get(path)
+        count = g.get("select_count", 0)
+    # Over SELECT_BUDGET the app fails the request itself
+    assert response.status_code == 200 or count > BUDGET, (path, response.status_code)
+    return count
+
+
+def page_counts(client, worker_id, company_id):
+    counts = {}
+
+    with client.session_transaction() as sess:
+        sess.clear()
+        sess["user_type"] = "worker"
+        sess["worker_id"] = worker_id
+    counts["/workerprofile"] = count_selects(client, "/workerprofile")
+    counts["/jobportal"] = count_selects(client, "/jobportal")
+
+    with client.session_transaction() as sess:
+        sess.clear()
+        sess["user_type"] = "company"
+        sess["company_id"] = company_id
+    counts["/companyprofile"] = count_selects(client, "/companyprofile")
+    counts["/application"] = count_selects(client, "/application")
+
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--light", type=int, default=5)
+    parser.add_argument("--heavy", type=int, default=500)
+    args = parser.parse_args()
+
+    with webapp.app.app_context():
+        light = seed_account(args.light)
+        heavy = seed_account(args.heavy)
+
+    client = webapp.app.test_client()
+    light_counts = page_counts(client, *light)
+    heavy_counts = page_counts(client, *heavy)
+
+    failed = False
+    for path, light_count in light_counts.items():
+        heavy_count = heavy_counts[path]
+        if max(light_count, heavy_count) > BUDGET:
+            status = f"OVER SELECT_BUDGET ({BUDGET})"
+        elif heavy_count > light_count:
+            status = "GROWS WITH ROWS"
+        else:
+            status = "ok"
+        failed = failed or status != "ok"
+        print(f"{path}: {light_count} SELECTs ({args.light} rows), "
+              f"{heavy_count} SELECTs ({args.heavy} rows)  {status}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
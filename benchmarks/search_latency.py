@@ -0,0 +1,91 @@
+"""Measure /jobportal?q= search latency on a large job table.
+
+Seeds a throwaway SQLite database with benchmarks/seed.py (--rows 700000
+gives about 105k jobs) unless --database points at one already seeded,
+then times load_job_page() with the result cache bypassed: the first
+page and the next one (cursor) for each query, alone and with a
+location filter. Prints p50/p95 in ms and how many jobs match each
+query; exits with status 1 if a first-page p50 is over --target-ms.
+
+Usage:
+    python benchmarks/search_latency.py [--rows 700000] [--repeat 50]
+        [--database sqlite:////tmp/load.db] [--target-ms 10]
+        [--query welder --query "machine operator"]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--rows", type=int, default=700000)
+parser.add_argument("--database", help="an already seeded DATABASE_URL")
+parser.add_argument("--repeat", type=int, default=50)
+parser.add_argument("--target-ms", type=float, default=10)
+parser.add_argument("--query", action="append")
+args = parser.parse_args()
+
+os.environ["DATABASE_URL"] = args.database or (
+    f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'search.db')}"
+)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import app as webapp  # noqa: E402
+from app import db  # noqa: E402
+from seed import seed_database  # noqa: E402
+
+QUERIES = args.query or ["welder", "operator", "machine operator", "forklift", "cnc"]
+
+
+def filters(q, location=""):
+    return {"location": location, "category": "", "shift": "", "q": q,
+            "salary_min": None, "salary_max": None, "max_experience": None}
+
+
+def timed(page_filters, after=None, after_score=None):
+    """Return (p50_ms, p95_ms, next_cursor) over --repeat runs."""
+    latencies = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        _, next_cursor = webapp.load_job_page(page_filters, after, after_score)
+        latencies.append((time.perf_counter() - started) * 1000)
+    latencies.sort()
+    return latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.95)], next_cursor
+
+
+def main():
+    with webapp.app.app_context():
+        if not args.database:
+            seed_database(args.rows, log=lambda line: None)
+        jobs = db.session.query(db.func.count(webapp.JobPOST.job_id)).scalar()
+        print(f"{jobs} jobs, search backend {webapp.SEARCH_BACKEND}, {args.repeat} runs each")
+        print(f"{'query':<34}{'matches':>8}{'page 1 p50':>12}{'p95':>8}{'page 2 p50':>12}{'p95':>8}")
+
+        slow = []
+        for q in QUERIES:
+            for location in ["", "Chakan MIDC"]:
+                hits = webapp.job_search_hits(q)
+                matches = db.session.execute(
+                    db.select(db.func.count()).select_from(hits)
+                ).scalar() if hits is not None else 0
+                first_p50, first_p95, cursor = timed(filters(q, location))
+                second = ("-", "-")
+                if cursor:
+                    p50, p95, _ = timed(filters(q, location), *cursor)
+                    second = (f"{p50:.2f}", f"{p95:.2f}")
+                label = f"{q} @ {location}" if location else q
+                print(f"{label:<34}{matches:>8}{first_p50:>12.2f}{first_p95:>8.2f}"
+                      f"{second[0]:>12}{second[1]:>8}")
+                if first_p50 > args.target_ms:
+                    slow.append(label)
+
+        print(f"first page p50 over {args.target_ms:g} ms: {', '.join(slow)}" if slow
+              else f"every first page p50 is under {args.target_ms:g} ms")
+    sys.exit(1 if slow else 0)
+
+
+if __name__ == "__main__":
+    main()
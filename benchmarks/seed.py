@@ -0,0 +1,250 @@
+"""Fill a database with synthetic workers, companies, jobs and listings.
+
+--rows is the total number of rows, split roughly like a live site:
+25% workers, 2% companies, 15% jobs, 40% applications and 9% each of
+sell items and buy requirements. Popularity is skewed the way real
+traffic is: a few companies post most of the jobs, a few jobs get most
+of the applications, and categories/locations follow a Zipf curve over
+the options the forms offer. The same --seed gives the same data.
+
+Rows are bulk-inserted in batches without going through the ORM, so 1M
+rows take minutes rather than hours. Every account's password is
+"password". The market_match table is not filled; run
+`flask match-market` afterwards if a benchmark needs it.
+
+Usage:
+    python benchmarks/seed.py --database sqlite:////tmp/load.db [--rows 100000]
+        [--seed 42] [--batch-size 10000]
+"""
+import argparse
+import bisect
+import itertools
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+LOCATIONS = ["Chakan MIDC", "Pimpri MIDC", "Talegaon MIDC", "Bhosari MIDC",
+             "Tathawade MIDC", "Khed MIDC", "Kharadi MIDC", "Hinjewadi MIDC"]
+JOB_CATEGORIES = ["Factory Worker", "Machine Operator", "Welder", "Electrician", "Helper",
+                  "Supervisor", "Quality Inspector", "Forklift Operator", "Packaging Staff",
+                  "Loader / Unloader", "Security Guard", "Driver"]
+SHIFTS = ["Day Shift", "Night Shift", "Rotational"]
+COMPANY_CATEGORIES = ["Manufacturing", "Automotive", "Engineering", "Logistics", "Chemicals"]
+MARKET_CATEGORIES = ["Raw Material", "Machinery", "Electrical", "Services", "Other"]
+SKILLS = ["Welding", "CNC operation", "Wiring", "Packing", "Forklift", "Inspection",
+          "Lathe", "Assembly", "Driving", "Loading"]
+PRODUCTS = ["Steel sheets", "Copper wire", "Hydraulic press", "Lathe machine", "Control panel",
+            "Industrial cable", "Packaging boxes", "Plastic granules", "Welding rods",
+            "Conveyor belt", "Transport service", "Maintenance contract"]
+APPLICATION_STATUSES = ["pending"] * 6 + ["selected", "rejected"]
+
+
+class Zipf:
+    """Draw indexes 0..n-1, index k with weight 1 / (k + 1) ** s."""
+
+    def __init__(self, rng, n, s=1.1):
+        self.rng = rng
+        self.cumulative = list(itertools.accumulate(1 / (k + 1) ** s for k in range(n)))
+
+    def __call__(self):
+        point = self.rng.random() * self.cumulative[-1]
+        return bisect.bisect(self.cumulative, point)
+
+
+def row_counts(rows):
+    return {
+        "worker": max(10, rows * 25 // 100),
+        "company": max(5, rows * 2 // 100),
+        "job_post": max(10, rows * 15 // 100),
+        "application": max(10, rows * 40 // 100),
+        "sell_item": max(5, rows * 9 // 100),
+        "buy_item": max(5, rows * 9 // 100),
+    }
+
+
+def salary_range(rng):
+    low = rng.randrange(9, 30) * 1000
+    return low, low + rng.choice([0, 2000, 3000, 5000])
+
+
+def salary_text(low, high):
+    return f"{low}" if low == high else f"{low}-{high}"
+
+
+def seed_database(rows, seed=42, batch_size=10000, log=print):
+    """Insert about `rows` rows; returns the row count per table.
+
+    Must run inside an app context on an empty (or freshly created) schema:
+    ids are assigned here, starting at 1.
+    """
+    import app as webapp
+    from app import Application, Company, JobPOST, Worker, buyitem, db, sellitem
+
+    rng = random.Random(seed)
+    counts = row_counts(rows)
+    password = webapp.hash_password("password")
+    now = datetime.utcnow()
+
+    def ago(days):
+        return now - timedelta(seconds=rng.randrange(int(days * 86400)))
+
+    def insert(model, generate):
+        started = time.perf_counter()
+        batch = []
+        for row in generate:
+            batch.append(row)
+            if len(batch) == batch_size:
+                db.session.execute(db.insert(model.__table__), batch)
+                batch = []
+        if batch:
+            db.session.execute(db.insert(model.__table__), batch)
+        db.session.commit()
+        log(f"{model.__tablename__}: {counts[model.__tablename__]} rows "
+            f"in {time.perf_counter() - started:.1f}s")
+
+    location = Zipf(rng, len(LOCATIONS))
+    job_category = Zipf(rng, len(JOB_CATEGORIES))
+    market_category = Zipf(rng, len(MARKET_CATEGORIES))
+
+    insert(Worker, (
+        dict(id=i, username=f"worker{i}", password=password, email=f"worker{i}@example.com",
+             phone_no=f"9{i:09d}"[-10:], kyc_status="pending", updated_at=ago(365),
+             created_at=ago(365))
+        for i in range(1, counts["worker"] + 1)
+    ))
+
+    insert(Company, (
+        dict(id=i, email=f"company{i}@example.com", password=password,
+             company_name=f"Company {i} Pvt Ltd",
+             company_category=rng.choice(COMPANY_CATEGORIES),
+             company_location=LOCATIONS[location()], company_contact=f"8{i:09d}"[-10:],
+             company_address=f"Plot {i}, MIDC", created_at=ago(730))
+        for i in range(1, counts["company"] + 1)
+    ))
+
+    # A few big employers post most of the jobs
+    posting_company = Zipf(rng, counts["company"])
+
+    def jobs():
+        for job_id in range(1, counts["job_post"] + 1):
+            low, high = salary_range(rng)
+            experience = rng.choice([0, 0, 1, 2, 3, 5])
+            category = JOB_CATEGORIES[job_category()]
+            yield dict(
+                job_id=job_id, company_id=posting_company() + 1,
+                job_title=f"{category} {job_id}", job_category=category,
+                job_location=LOCATIONS[location()], job_specific_location=f"Gate {rng.randrange(1, 10)}",
+                job_experience="Fresher" if experience == 0 else f"{experience}-{experience + 2} years",
+                job_shift=rng.choice(SHIFTS), job_salary=salary_text(low, high),
+                job_contact="9999999999",
+                job_description=f"{category} needed for {rng.choice(SKILLS).lower()} work.",
+                updated_at=ago(90), salary_min=low, salary_max=high,
+                experience_min=float(experience),
+                experience_max=None if experience == 0 else float(experience + 2),
+                parsed_version=webapp.NUMBER_PARSER_VERSION,
+            )
+
+    insert(JobPOST, jobs())
+
+    # A few jobs get most of the applications; each worker applies once per job
+    popular_job = Zipf(rng, counts["job_post"], s=0.9)
+
+    def applications():
+        seen = set()
+        application_id = 0
+        while application_id < counts["application"]:
+            job_id, worker_id = popular_job() + 1, rng.randrange(1, counts["worker"] + 1)
+            if (job_id, worker_id) in seen:
+                continue
+            seen.add((job_id, worker_id))
+            application_id += 1
+            low, high = salary_range(rng)
+            yield dict(
+                application_id=application_id, job_id=job_id, worker_id=worker_id,
+                applicant_name=f"Worker {worker_id}", applicant_email=f"worker{worker_id}@example.com",
+                applicant_phone="9999999999", applicant_age=rng.randrange(18, 55),
+                applicant_gender=rng.choice(["Male", "Female"]),
+                applicant_skill=rng.choice(SKILLS), applicant_experience=f"{rng.randrange(0, 10)} years",
+                applicant_expected_salary=salary_text(low, high),
+                applicant_location=LOCATIONS[location()], applicant_preferred_shift=rng.choice(SHIFTS),
+                applicant_status=rng.choice(APPLICATION_STATUSES), application_date=ago(90),
+                expected_salary_min=low, expected_salary_max=high,
+                parsed_version=webapp.NUMBER_PARSER_VERSION,
+            )
+
+    insert(Application, applications())
+
+    trading_company = Zipf(rng, counts["company"])
+
+    def sell_items():
+        for sell_id in range(1, counts["sell_item"] + 1):
+            posted = ago(180)
+            yield dict(
+                sell_id=sell_id, sell_name=rng.choice(PRODUCTS),
+                sell_price=float(rng.randrange(1, 500) * 1000), sell_quantity=rng.randrange(1, 1000),
+                sell_description="Good condition, ready stock.",
+                sell_status="available" if rng.random() < 0.9 else "sold",
+                sell_date=posted, updated_at=posted,
+                posted_by=f"company{trading_company() + 1}@example.com",
+                sell_category=MARKET_CATEGORIES[market_category()], sell_location=LOCATIONS[location()],
+            )
+
+    insert(sellitem, sell_items())
+
+    def buy_items():
+        for buy_id in range(1, counts["buy_item"] + 1):
+            posted = ago(180)
+            yield dict(
+                buy_id=buy_id, buy_name=rng.choice(PRODUCTS),
+                buy_budget=None if rng.random() < 0.2 else float(rng.randrange(1, 500) * 1000),
+                buy_quantity=rng.randrange(1, 1000), buy_description="Need delivery within a month.",
+                buy_status="open" if rng.random() < 0.9 else "closed",
+                buy_date=posted, updated_at=posted,
+                posted_by=f"company{trading_company() + 1}@example.com",
+                buy_category=MARKET_CATEGORIES[market_category()], buy_location=LOCATIONS[location()],
+            )
+
+    insert(buyitem, buy_items())
+
+    if db.engine.dialect.name == "postgresql":
+        # Ids were set explicitly; move the sequences past them
+        for model, column in [(Worker, "id"), (Company, "id"), (JobPOST, "job_id"),
+                              (Application, "application_id"), (sellitem, "sell_id"),
+                              (buyitem, "buy_id")]:
+            table = model.__tablename__
+            db.session.execute(db.text(
+                f"SELECT setval(pg_get_serial_sequence('{table}', '{column}'), "
+                f"(SELECT MAX({column}) FROM {table}))"
+            ))
+        db.session.commit()
+
+    started = time.perf_counter()
+    webapp.rebuild_search_index()
+    log(f"search index: {time.perf_counter() - started:.1f}s")
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--database", required=True, help="DATABASE_URL of an empty database")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=10000)
+    args = parser.parse_args()
+
+    os.environ["DATABASE_URL"] = args.database
+    import app as webapp
+
+    with webapp.app.app_context():
+        if webapp.db.session.query(webapp.Worker.id).first():
+            sys.exit("Database already has workers; seed an empty one")
+        counts = seed_database(args.rows, args.seed, args.batch_size)
+    print(f"seeded {sum(counts.values())} rows into {args.database}")
+
+
+if __name__ == "__main__":
+    main()